@@ -0,0 +1,332 @@
+# End-to-end benchmarks of the framework's own overhead (prompt building, parsing, validation,
+# tool dispatch, scheduling ...). Every scenario runs against the local `MockLLMClient`, so there
+# is no network involved and the results are deterministic enough to be compared across commits.
+#
+# Usage:
+#
+#     python benchmarks/bench_agents.py                               # run every scenario
+#     python benchmarks/bench_agents.py -k react                      # run the scenarios matching "react"
+#     python benchmarks/bench_agents.py --save benchmarks/results/baseline.json
+#     python benchmarks/bench_agents.py --compare benchmarks/results/baseline.json
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from agentic_patterns.multiagent_pattern.agent import Agent  # noqa: E402
+from agentic_patterns.multiagent_pattern.crew import Crew  # noqa: E402
+from agentic_patterns.planning_pattern.react_agent import ReactAgent  # noqa: E402
+from agentic_patterns.reflection_pattern import ReflectionAgent  # noqa: E402
+from agentic_patterns.tool_pattern.tool import tool  # noqa: E402
+from agentic_patterns.tool_pattern.tool import Tool  # noqa: E402
+from agentic_patterns.tool_pattern.tool_agent import ToolAgent  # noqa: E402
+from agentic_patterns.utils.mock_llm import AsyncMockLLMClient  # noqa: E402
+from agentic_patterns.utils.mock_llm import MockLLMClient  # noqa: E402
+
+DESCRIPTION = "End-to-end benchmarks of the framework's own overhead."
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    rounds: int
+    repeat: int = 5
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(name: str, rounds: int, repeat: int = 5):
+    """
+    Registers a scenario. The decorated function builds everything the scenario needs and
+    returns the function that is timed. `rounds` is the number of LLM calls of a single run.
+    """
+
+    def register(setup: Callable[[], Callable[[], object]]):
+        SCENARIOS.append(Scenario(name, setup, rounds, repeat))
+        return setup
+
+    return register
+
+
+def make_tools(n: int, payload_size: int = 32) -> list[Tool]:
+    """
+    Builds `n` distinct tools returning a payload of `payload_size` characters.
+    """
+    tools = []
+    for i in range(n):
+
+        def fn(query: str, limit: int = 10, exact: bool = False) -> str:
+            return "x" * payload_size
+
+        fn.__name__ = f"lookup_{i}"
+        fn.__doc__ = f"Looks up `query` in data source number {i}."
+        tools.append(tool(fn))
+    return tools
+
+
+def tool_call(name: str, call_id: int) -> str:
+    arguments = {"query": f"q{call_id}", "limit": "5"}
+    return json.dumps({"name": name, "arguments": arguments, "id": call_id})
+
+
+def react_responder(n_rounds: int, tools: list[Tool], calls_per_round: int = 1):
+    """
+    Scripts a ReAct session: `n_rounds - 1` rounds of tool calls followed by the final response.
+    """
+
+    def respond(messages: list, model: str) -> str:
+        round_ = sum(1 for message in messages if message["role"] == "assistant")
+        if round_ >= n_rounds - 1:
+            return "<thought>I have everything</thought><response>Done</response>"
+        names = [tools[(round_ + i) % len(tools)].name for i in range(calls_per_round)]
+        calls = "".join(
+            f"<tool_call>{tool_call(name, i)}</tool_call>"
+            for i, name in enumerate(names)
+        )
+        return f"<thought>Round {round_}</thought>{calls}"
+
+    return respond
+
+
+def tool_agent_responder(tools: list[Tool], calls: int):
+    def respond(messages: list, model: str) -> str:
+        if messages[0]["role"] == "system":
+            return "".join(
+                f"<tool_call>{tool_call(tools[i % len(tools)].name, i)}</tool_call>"
+                for i in range(calls)
+            )
+        return "The answer is 42"
+
+    return respond
+
+
+@scenario("tool_agent_1_tool", rounds=2)
+def tool_agent_1_tool():
+    tools = make_tools(1)
+    client = MockLLMClient(responder=tool_agent_responder(tools, calls=1))
+    agent = ToolAgent(tools, client=client)
+    return lambda: agent.run("What's the answer?")
+
+
+@scenario("tool_agent_100_tools", rounds=2)
+def tool_agent_100_tools():
+    tools = make_tools(100)
+    client = MockLLMClient(responder=tool_agent_responder(tools, calls=5))
+    agent = ToolAgent(tools, client=client)
+    return lambda: agent.run("What's the answer?")
+
+
+@scenario("react_agent_10_rounds", rounds=10)
+def react_agent_10_rounds():
+    tools = make_tools(5)
+    client = MockLLMClient(responder=react_responder(10, tools))
+    agent = ReactAgent(tools, client=client)
+    return lambda: agent.run("What's the answer?", max_rounds=10)
+
+
+@scenario("react_agent_10_rounds_streaming", rounds=10)
+def react_agent_10_rounds_streaming():
+    tools = make_tools(5)
+    client = MockLLMClient(responder=react_responder(10, tools, calls_per_round=3))
+    agent = ReactAgent(tools, client=client, max_tool_workers=3)
+    return lambda: agent.run("What's the answer?", max_rounds=10, stream=True)
+
+
+@scenario("react_agent_long_history", rounds=40, repeat=3)
+def react_agent_long_history():
+    # Every observation is ~20KB, so the prompt grows to ~800KB by the last round
+    tools = make_tools(5, payload_size=20_000)
+    client = MockLLMClient(responder=react_responder(40, tools))
+    agent = ReactAgent(tools, client=client)
+    return lambda: agent.run("What's the answer?", max_rounds=40)
+
+
+@scenario("reflection_agent_10_steps", rounds=20)
+def reflection_agent_10_steps():
+    client = MockLLMClient(responses=["A draft " * 100, "Make it shorter " * 20])
+    agent = ReflectionAgent(client=client)
+    return lambda: agent.run("Write a product description", n_steps=10)
+
+
+def build_crew(n_layers: int, width: int, client=None, async_client=None) -> Crew:
+    """
+    Builds a layered DAG of `n_layers * width` agents, where every agent depends on all
+    the agents of the previous layer.
+    """
+    with Crew() as crew:
+        previous: list[Agent] = []
+        for layer in range(n_layers):
+            current = [
+                Agent(
+                    name=f"agent_{layer}_{i}",
+                    backstory="You are a meticulous researcher.",
+                    task_description=f"Research topic {i} of layer {layer}.",
+                    client=client,
+                    async_client=async_client,
+                )
+                for i in range(width)
+            ]
+            for agent in current:
+                for dependency in previous:
+                    agent.add_dependency(dependency)
+            previous = current
+    return crew
+
+
+def reset_context(crew: Crew):
+    # Agents keep the context received from their dependencies across runs
+    for agent in crew.agents:
+        agent.clear_context()
+
+
+@scenario("crew_50_agents_sequential", rounds=50, repeat=1)
+def crew_50_agents_sequential():
+    crew = build_crew(5, 10, client=MockLLMClient())
+
+    def run():
+        reset_context(crew)
+        crew.run()
+
+    return run
+
+
+@scenario("crew_50_agents_concurrent", rounds=50, repeat=1)
+def crew_50_agents_concurrent():
+    # With 10ms of simulated latency per call, the ideal makespan is 5 layers * 10ms
+    crew = build_crew(5, 10, client=MockLLMClient(latency=0.01))
+
+    def run():
+        reset_context(crew)
+        crew.run(max_workers=10)
+
+    return run
+
+
+@scenario("crew_50_agents_async", rounds=50, repeat=1)
+def crew_50_agents_async():
+    crew = build_crew(5, 10, async_client=AsyncMockLLMClient(latency=0.01))
+
+    def run():
+        reset_context(crew)
+        asyncio.run(crew.arun(max_concurrency=10))
+
+    return run
+
+
+def run_scenario(scenario: Scenario, repeat: int | None = None) -> dict:
+    fn = scenario.setup()
+    timings = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat or scenario.repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "repeat": len(timings),
+        "rounds": scenario.rounds,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "per_round_ms": median / scenario.rounds * 1000,
+        "rounds_per_s": scenario.rounds / median if median else float("inf"),
+    }
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    Prints the relative change of every scenario against a baseline and returns whether any
+    scenario got slower than `max_regression` (e.g. 0.25 for 25%).
+    """
+    regressed = False
+    print(f"\n{'scenario':<36}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<36}{'-':>14}{result['median_s'] * 1000:>14.2f}{'new':>10}")
+            continue
+        before, after = baseline[name]["median_s"], result["median_s"]
+        change = (after - before) / before if before else 0.0
+        flag = " !" if change > max_regression else ""
+        regressed = regressed or bool(flag)
+        print(
+            f"{name:<36}{before * 1000:>14.2f}{after * 1000:>14.2f}"
+            f"{change:>+9.1%}{flag}"
+        )
+    return regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("-k", "--filter", default="", help="Run matching scenarios")
+    parser.add_argument("--repeat", type=int, help="Override the repetitions")
+    parser.add_argument("--save", help="Store the results in this JSON file")
+    parser.add_argument("--compare", help="Compare with the results in this file")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="Relative slowdown tolerated by --compare before failing (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'scenario':<36}{'median ms':>12}{'per round ms':>14}{'rounds/s':>12}")
+    for scenario in SCENARIOS:
+        if args.filter not in scenario.name:
+            continue
+        result = run_scenario(scenario, args.repeat)
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<36}{result['median_s'] * 1000:>12.2f}"
+            f"{result['per_round_ms']:>14.3f}{result['rounds_per_s']:>12.1f}"
+        )
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"metadata": metadata(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
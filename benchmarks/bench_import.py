@@ -0,0 +1,89 @@
+# Import-time benchmark: measures how long importing the package takes in a fresh interpreter, and
+# checks that no heavy optional dependency (the LLM SDKs, graphviz, colorama, dotenv, httpx) is
+# imported before it's actually used. Cold starts (CLIs, serverless functions, test runs) pay
+# this cost every time.
+#
+# Usage:
+#
+#     python benchmarks/bench_import.py                               # default module and budget
+#     python benchmarks/bench_import.py --budget-ms 150 --repeat 20
+#     python benchmarks/bench_import.py -m agentic_patterns.planning_pattern.react_agent
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DESCRIPTION = "Import-time benchmark of the package."
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+DEFAULT_MODULE = "agentic_patterns.multiagent_pattern.agent"
+DEFAULT_BUDGET_MS = 200.0
+HEAVY_MODULES = ("groq", "openai", "graphviz", "colorama", "dotenv", "httpx")
+
+# Runs in the child interpreter: imports the module and reports the elapsed time and the heavy
+# modules it pulled in, as JSON on stdout.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """
+    Imports a module in a fresh interpreter.
+
+    Args:
+        module (str): The dotted name of the module.
+
+    Returns:
+        dict: The import time in seconds (`seconds`) and the heavy modules imported (`heavy`).
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("-m", "--module", default=DEFAULT_MODULE)
+    parser.add_argument("--repeat", type=int, default=10, help="Number of imports")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Maximum median import time (default: {DEFAULT_BUDGET_MS:g})",
+    )
+    args = parser.parse_args()
+
+    measure(args.module)  # Warm-up, so the bytecode cache is written
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    median_ms = statistics.median(run["seconds"] for run in runs) * 1000
+    heavy = sorted({name for run in runs for name in run["heavy"]})
+
+    print(f"{args.module}: median {median_ms:.1f} ms over {args.repeat} imports")
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(heavy)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: over the budget of {args.budget_ms:g} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,20 @@
+import contextvars
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
 from textwrap import dedent
 
+from agentic_patterns.multiagent_pattern.context import ContextSlot
+from agentic_patterns.multiagent_pattern.context import is_by_reference
+from agentic_patterns.multiagent_pattern.context import render_context
+from agentic_patterns.multiagent_pattern.context import Summarizer
 from agentic_patterns.multiagent_pattern.crew import Crew
 from agentic_patterns.planning_pattern.react_agent import ReactAgent
 from agentic_patterns.tool_pattern.tool import Tool
+from agentic_patterns.tool_pattern.tool import tool
+from agentic_patterns.utils.tracing import span
 
 
 class Agent:
@@ -20,7 +32,12 @@ class Agent:
         react_agent (ReactAgent): An instance of ReactAgent used for generating responses.
         dependencies (list[Agent]): A list of Agent instances that this agent depends on.
         dependents (list[Agent]): A list of Agent instances that depend on this agent.
-        context (str): Accumulated context information from other agents.
+        context_slots (dict[str, ContextSlot]): The outputs received from other agents, by agent name.
+        context_token_budget (int | None): The maximum number of tokens of the context in the prompt.
+        context_reference_tokens (int | None): The size above which an output is passed by reference.
+        context_summarizer (Summarizer | None): The function shortening the outputs over the budget.
+        priority (int): The scheduling hint of the agent: among the agents ready to run concurrently,
+            the ones with a lower value start first, like the priorities of `request_priority`.
 
     Args:
         name (str): The name of the agent.
@@ -29,6 +46,18 @@ class Agent:
         task_expected_output (str, optional): The expected format or content of the task output. Defaults to "".
         tools (list[Tool] | None, optional): A list of Tool instances available to the agent. Defaults to None.
         llm (str, optional): The name of the language model to use. Defaults to "llama-3.3-70b-versatile".
+        client (optional): The client used by the underlying ReactAgent. Defaults to the shared Groq client.
+        async_client (optional): The async client used by the underlying ReactAgent. Defaults to the shared
+            AsyncGroq client.
+        context_token_budget (int | None, optional): The maximum number of tokens of the context received from
+            other agents, shared among them. Oversized outputs are truncated. Defaults to None (no limit).
+        context_reference_tokens (int | None, optional): Outputs bigger than this many tokens are passed by
+            reference: the prompt only shows an excerpt and the agent gets a `read_context` tool to read the
+            rest. Defaults to None (always inlined).
+        context_summarizer (Summarizer | None, optional): A function `(text, max_tokens) -> str` shortening
+            the outputs over the budget instead of truncating them (e.g. with a cheaper model).
+        priority (int, optional): The scheduling hint of the agent (lower values start first). Defaults
+            to 0, leaving the order to the crew's critical path estimates.
     """
 
     def __init__(
@@ -39,19 +68,35 @@ class Agent:
         task_expected_output: str = "",
         tools: list[Tool] | None = None,
         llm: str = "llama-3.3-70b-versatile",
+        client=None,
+        async_client=None,
+        context_token_budget: int | None = None,
+        context_reference_tokens: int | None = None,
+        context_summarizer: Summarizer | None = None,
+        priority: int = 0,
     ):
         self.name = name
         self.backstory = backstory
         self.task_description = task_description
         self.task_expected_output = task_expected_output
         self.react_agent = ReactAgent(
-            model=llm, system_prompt=self.backstory, tools=tools or []
+            model=llm,
+            system_prompt=self.backstory,
+            tools=tools or [],
+            client=client,
+            async_client=async_client,
         )
 
         self.dependencies: list[Agent] = []  # Agents that this agent depends on
         self.dependents: list[Agent] = []  # Agents that depend on this agent
 
-        self.context = ""
+        self.context_slots: dict[str, ContextSlot] = {}
+        self.context_token_budget = context_token_budget
+        self.context_reference_tokens = context_reference_tokens
+        self.context_summarizer = context_summarizer
+        self.priority = priority
+        self._tools = self.react_agent.tools
+        self._read_context_tool = tool(self._read_context_fn())
 
         # Automatically register this agent to the active Crew context if one exists
         Crew.register_agent(self)
@@ -146,14 +191,113 @@ class Agent:
         else:
             raise TypeError("The dependent must be an instance or list of Agent.")
 
-    def receive_context(self, input_data):
+    def receive_context(self, input_data, source: str | None = None):
         """
-        Receives and stores context information from other agents.
+        Receives and stores context information from other agents, in one slot per agent. A new output
+        of the same agent replaces the previous one.
 
         Args:
             input_data (str): The context information to be added.
+            source (str | None, optional): The name of the agent the context comes from. Defaults to a
+                new slot.
         """
-        self.context += f"{self.name} received context: \n{input_data}"
+        source = source or f"context_{len(self.context_slots) + 1}"
+        self.context_slots[source] = ContextSlot(source, str(input_data))
+
+    def clear_context(self):
+        """
+        Forgets the context received from other agents.
+        """
+        self.context_slots.clear()
+
+    @property
+    def context(self) -> str:
+        """
+        Returns the context received from other agents, as rendered in the prompt.
+        """
+        return render_context(
+            list(self.context_slots.values()),
+            token_budget=self.context_token_budget,
+            reference_tokens=self.context_reference_tokens,
+            summarizer=self.context_summarizer,
+        )
+
+    def checkpoint_key(self) -> str:
+        """
+        Hashes everything the agent's output depends on: its task, backstory, model, tools and
+        context settings, and the full outputs received from the other agents. The crew reuses a
+        checkpointed output as long as this key doesn't change.
+
+        Tools are identified by their signature, so a change in a tool's code alone doesn't
+        invalidate the checkpoints.
+
+        Returns:
+            str: The SHA-256 hex digest of the agent's inputs.
+        """
+        payload = json.dumps(
+            {
+                "name": self.name,
+                "backstory": self.backstory,
+                "task_description": self.task_description,
+                "task_expected_output": self.task_expected_output,
+                "model": self.react_agent.model,
+                "tools": [tool.fn_signature for tool in self._tools],
+                "context_token_budget": self.context_token_budget,
+                "context_reference_tokens": self.context_reference_tokens,
+                "context": [
+                    [slot.source, slot.text] for slot in self.context_slots.values()
+                ],
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def to_spec(self, client_factory: Callable | None = None) -> "AgentSpec":
+        """
+        Builds the picklable description of the agent and of the context it has received, used
+        to run it in a worker process.
+
+        Args:
+            client_factory (Callable | None, optional): A picklable function creating the client in
+                the worker. Defaults to None (the agent's own client, which must then be picklable,
+                or the worker's shared one).
+
+        Returns:
+            AgentSpec: The agent's spec.
+        """
+        return AgentSpec(
+            name=self.name,
+            backstory=self.backstory,
+            task_description=self.task_description,
+            task_expected_output=self.task_expected_output,
+            tools=list(self._tools),
+            llm=self.react_agent.model,
+            client=None if client_factory else self.react_agent._client,
+            client_factory=client_factory,
+            context_token_budget=self.context_token_budget,
+            context_reference_tokens=self.context_reference_tokens,
+            context_summarizer=self.context_summarizer,
+            context=[(slot.source, slot.text) for slot in self.context_slots.values()],
+        )
+
+    def _read_context_fn(self):
+        slots = self.context_slots
+
+        def read_context(source: str, offset: int = 0, length: int = 4000) -> str:
+            """
+            Reads a part of the full output of another agent, when the context only shows an excerpt.
+
+            Args:
+                source (str): The name of the agent that produced the output.
+                offset (int): The position of the first character to read.
+                length (int): The number of characters to read.
+            """
+            if source not in slots:
+                raise ValueError(f"Unknown context source: {source}")
+            return slots[source].text[offset : offset + length]
+
+        return read_context
 
     def create_prompt(self):
         """
@@ -162,6 +306,15 @@ class Agent:
         Returns:
             str: The formatted prompt string.
         """
+        # The read_context tool is only offered when some output is passed by reference
+        by_reference = any(
+            is_by_reference(slot, self.context_reference_tokens)
+            for slot in self.context_slots.values()
+        )
+        self.react_agent.tools = (
+            self._tools + [self._read_context_tool] if by_reference else self._tools
+        )
+
         prompt = dedent(
             f"""
         You are an AI agent. You are part of a team of agents working together to complete a task.
@@ -191,19 +344,93 @@ class Agent:
 
         return prompt
 
-    def run(self):
+    def run(self, notify_dependents: bool = True):
         """
         Runs the agent's task and generates the output.
 
         This method creates a prompt, runs it through the ReactAgent, and passes the output to all dependent agents.
 
+        Args:
+            notify_dependents (bool, optional): Whether to pass the output to the dependent agents. Defaults to True.
+                The Crew disables it when running agents concurrently, so it can hand over the context
+                in a deterministic order.
+
         Returns:
             str: The output generated by the agent.
         """
-        msg = self.create_prompt()
-        output = self.react_agent.run(user_msg=msg)
+        with span("crew.agent", agent=self.name):
+            msg = self.create_prompt()
+            output = self.react_agent.run(user_msg=msg)
 
         # Pass the output to all dependents
-        for dependent in self.dependents:
-            dependent.receive_context(output)
+        if notify_dependents:
+            for dependent in self.dependents:
+                dependent.receive_context(output, source=self.name)
+        return output
+
+    async def arun(self, notify_dependents: bool = True):
+        """
+        Asynchronous version of `run`, running the task through `ReactAgent.arun`.
+
+        Args:
+            notify_dependents (bool, optional): Whether to pass the output to the dependent agents. Defaults to True.
+
+        Returns:
+            str: The output generated by the agent.
+        """
+        with span("crew.agent", agent=self.name):
+            msg = self.create_prompt()
+            output = await self.react_agent.arun(user_msg=msg)
+
+        if notify_dependents:
+            for dependent in self.dependents:
+                dependent.receive_context(output, source=self.name)
         return output
+
+
+@dataclass
+class AgentSpec:
+    """
+    A picklable description of an agent, with the context it has received, from which a worker
+    process re-creates and runs the agent. Tools are pickled by reference (see `Tool.__reduce__`),
+    so they must be defined at the top level of a module importable by the workers.
+    """
+
+    name: str
+    backstory: str
+    task_description: str
+    task_expected_output: str = ""
+    tools: list[Tool] = field(default_factory=list)
+    llm: str = "llama-3.3-70b-versatile"
+    client: object = None
+    client_factory: Callable | None = None
+    context_token_budget: int | None = None
+    context_reference_tokens: int | None = None
+    context_summarizer: Summarizer | None = None
+    context: list[tuple[str, str]] = field(default_factory=list)
+
+    def run(self) -> str:
+        """
+        Re-creates the agent and runs it, without notifying any dependent.
+
+        Returns:
+            str: The output generated by the agent.
+        """
+        # Built in an empty context, where no crew is active, so the agent isn't registered to
+        # a crew inherited from the coordinator process
+        agent = contextvars.Context().run(
+            Agent,
+            name=self.name,
+            backstory=self.backstory,
+            task_description=self.task_description,
+            task_expected_output=self.task_expected_output,
+            tools=self.tools,
+            llm=self.llm,
+            client=self.client_factory() if self.client_factory else self.client,
+            context_token_budget=self.context_token_budget,
+            context_reference_tokens=self.context_reference_tokens,
+            context_summarizer=self.context_summarizer,
+        )
+        for source, text in self.context:
+            agent.receive_context(text, source=source)
+        return agent.run(notify_dependents=False)
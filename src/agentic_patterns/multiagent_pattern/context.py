@@ -0,0 +1,136 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+
+from agentic_patterns.utils.tokens import CHARS_PER_TOKEN
+from agentic_patterns.utils.tokens import estimate_tokens
+
+# A function shortening a text to (about) a number of tokens, e.g. by asking a model
+# to summarise it
+Summarizer = Callable[[str, int], str]
+
+
+@dataclass
+class ContextSlot:
+    """
+    The output an agent received from one of its dependencies. The slot holds a reference to the
+    output, not a copy: the same string is shared by every dependent.
+
+    Attributes:
+        source (str): The name of the agent that produced the output.
+        text (str): The full output.
+        tokens (int): The estimated number of tokens of the output.
+    """
+
+    source: str
+    text: str
+    tokens: int = field(init=False)
+
+    def __post_init__(self):
+        self.tokens = estimate_tokens(self.text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Keeps the beginning of a text, up to (about) `max_tokens` tokens, cutting at a line or word
+    boundary when there's one close enough.
+
+    Args:
+        text (str): The text to truncate.
+        max_tokens (int): The maximum number of tokens kept.
+
+    Returns:
+        str: The truncated text (the text itself if it already fits).
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    for separator in ("\n", " "):
+        boundary = cut.rfind(separator)
+        if boundary >= max_chars * 0.8:
+            return cut[:boundary]
+    return cut
+
+
+def allocate_budget(sizes: list[int], budget: int) -> list[int]:
+    """
+    Shares a token budget among the slots: every slot gets an even share, and the share a small
+    slot doesn't need is redistributed among the bigger ones.
+
+    Args:
+        sizes (list[int]): The tokens of each slot.
+        budget (int): The total number of tokens.
+
+    Returns:
+        list[int]: The tokens allocated to each slot, in the same order.
+    """
+    shares = [0] * len(sizes)
+    remaining = budget
+    by_size = sorted(range(len(sizes)), key=sizes.__getitem__)
+    for position, index in enumerate(by_size):
+        shares[index] = min(sizes[index], remaining // (len(sizes) - position))
+        remaining -= shares[index]
+    return shares
+
+
+def is_by_reference(slot: ContextSlot, reference_tokens: int | None) -> bool:
+    """
+    Checks whether a slot is too big to be inlined, and must be passed by reference.
+    """
+    return reference_tokens is not None and slot.tokens > reference_tokens
+
+
+def render_context(
+    slots: list[ContextSlot],
+    token_budget: int | None = None,
+    reference_tokens: int | None = None,
+    summarizer: Summarizer | None = None,
+) -> str:
+    """
+    Renders the context slots of an agent for its prompt, one section per dependency.
+
+    Outputs over `reference_tokens` are passed by reference: the prompt shows an excerpt, and the
+    agent reads the rest on demand with the `read_context` tool. The other outputs are shown in
+    full if they fit in their share of the budget, and are otherwise truncated (or summarised
+    with `summarizer`).
+
+    Args:
+        slots (list[ContextSlot]): The slots, in the order of the agent's dependencies.
+        token_budget (int | None, optional): The maximum number of tokens of the whole context.
+                                             Defaults to None (no limit).
+        reference_tokens (int | None, optional): The size above which an output is passed by
+                                                 reference, which is also the maximum size of its
+                                                 excerpt. Defaults to None (always inlined).
+        summarizer (Summarizer | None, optional): The function shortening an oversized output.
+                                                  Defaults to None (truncation).
+
+    Returns:
+        str: The rendered context.
+    """
+    by_reference = [is_by_reference(slot, reference_tokens) for slot in slots]
+    sizes = [
+        reference_tokens if reference else slot.tokens
+        for slot, reference in zip(slots, by_reference)
+    ]
+    shares = sizes if token_budget is None else allocate_budget(sizes, token_budget)
+
+    sections = []
+    for slot, reference, share in zip(slots, by_reference, shares):
+        if reference:
+            text = truncate_to_tokens(slot.text, share)
+            if len(text) < len(slot.text):
+                text += (
+                    f"\n[... excerpt of a {slot.tokens}-token output. Call the "
+                    f'read_context tool with source="{slot.source}" to read the rest]'
+                )
+        elif share < slot.tokens:
+            if summarizer is not None:
+                text = summarizer(slot.text, share)
+            else:
+                text = truncate_to_tokens(slot.text, share)
+                text += f"\n[... truncated, {slot.tokens - share} tokens omitted]"
+        else:
+            text = slot.text
+        sections.append(f"Output of {slot.source}:\n{text}")
+    return "\n\n".join(sections)
@@ -1,9 +1,62 @@
+import asyncio
+import contextvars
+import heapq
+import logging
+import time
+import warnings
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
-from colorama import Fore
-from graphviz import Digraph  # type: ignore
+from agentic_patterns.multiagent_pattern.scheduling import critical_path_report
+from agentic_patterns.multiagent_pattern.scheduling import CriticalPathReport
+from agentic_patterns.multiagent_pattern.scheduling import DurationHistory
+from agentic_patterns.multiagent_pattern.scheduling import remaining_path_lengths
+from agentic_patterns.utils.cache import MISSING
+from agentic_patterns.utils.cache import SQLiteCache
+from agentic_patterns.utils.tokens import measure_usage
+from agentic_patterns.utils.tracing import span
 
-from agentic_patterns.utils.logging import fancy_print
+logger = logging.getLogger(__name__)
+
+# The crew agents register to when they are created. Being context-local, crews can be built
+# concurrently in threads or asyncio tasks, and nested.
+_current_crew: contextvars.ContextVar["Crew | None"] = contextvars.ContextVar(
+    "current_crew", default=None
+)
+
+
+def _run_spec(spec) -> tuple[str, float, int]:
+    """
+    Runs an agent spec in a worker process, measuring its duration and token usage.
+    """
+    start = time.perf_counter()
+    with measure_usage() as usage:
+        output = spec.run()
+    return output, time.perf_counter() - start, usage.tokens
+
+
+class _CurrentCrewAlias:
+    """
+    `Crew.current_crew`, formerly the class attribute holding the active crew, kept as a
+    deprecated read-only alias of `Crew.current()`.
+    """
+
+    def __get__(self, instance, owner=None) -> "Crew | None":
+        warnings.warn(
+            "Crew.current_crew is deprecated, use Crew.current() instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return _current_crew.get()
+
+    def __set__(self, instance, value):
+        raise AttributeError(
+            "Crew.current_crew is read-only, use a `with crew:` block instead"
+        )
 
 
 class Crew:
@@ -13,15 +66,49 @@ class Crew:
     This class manages a group of agents, their dependencies, and provides methods
     for running the agents in a topologically sorted order.
 
+    Agent outputs can be checkpointed, so a rerun only runs the agents whose inputs changed
+    (their task, their settings or the outputs of their dependencies), make-style. Since every
+    output is stored as soon as its agent finishes, a rerun after a failure resumes where the
+    crew stopped.
+
+    The duration and token usage of every agent are recorded across runs. When agents run
+    concurrently, the ready agents start by priority hint (`Agent.priority`, lowest first), then by
+    the estimated length of their longest remaining path, so the critical path is never kept
+    waiting behind shorter branches. Each run ends with a report of its actual critical path.
+
+    Agents created inside a `with crew:` block are added to the crew. The active crew is
+    context-local: it follows the code into the asyncio tasks started in the block, but not into
+    other threads (unless they run in a copy of the context), and leaving a nested block
+    restores the enclosing crew.
+
     Attributes:
-        current_crew (Crew): Class-level variable to track the active Crew context.
         agents (list): A list of agents in the crew.
+        checkpoints (LRUCache | SQLiteCache | None): The store of the agent outputs, keyed by
+                                                     `Agent.checkpoint_key`, if any.
+        history (DurationHistory): The durations and token usage of the agents across runs.
+        last_report (CriticalPathReport | None): The critical path report of the last run.
+        current_crew (Crew | None): Deprecated alias of `Crew.current()`.
+
+    Args:
+        checkpoints (str | LRUCache | SQLiteCache | None, optional): The path of a SQLite database
+            storing the checkpoints, or a cache object (anything with the `get`/`set` interface of
+            `LRUCache`). Defaults to None (every run runs every agent).
+        history (str | DurationHistory | None, optional): The history of the agents' runs, or the
+            path of a SQLite database storing it. Defaults to an in-memory history.
     """
 
-    current_crew = None
+    current_crew = _CurrentCrewAlias()
 
-    def __init__(self):
+    def __init__(self, checkpoints=None, history=None):
         self.agents = []
+        self.checkpoints = (
+            SQLiteCache(checkpoints) if isinstance(checkpoints, str) else checkpoints
+        )
+        if not isinstance(history, DurationHistory):
+            history = DurationHistory(history)
+        self.history = history
+        self.last_report: CriticalPathReport | None = None
+        self._context_tokens: list[contextvars.Token] = []
 
     def __enter__(self):
         """
@@ -30,19 +117,26 @@ class Crew:
         Returns:
             Crew: The current Crew instance.
         """
-        Crew.current_crew = self
+        self._context_tokens.append(_current_crew.set(self))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Exits the context manager, clearing the active context.
+        Exits the context manager, restoring the enclosing crew (if any) as the active context.
 
         Args:
             exc_type: The exception type, if an exception was raised.
             exc_val: The exception value, if an exception was raised.
             exc_tb: The traceback, if an exception was raised.
         """
-        Crew.current_crew = None
+        _current_crew.reset(self._context_tokens.pop())
+
+    @staticmethod
+    def current() -> "Crew | None":
+        """
+        Returns the active crew of the current context, if any.
+        """
+        return _current_crew.get()
 
     def add_agent(self, agent):
         """
@@ -50,7 +144,14 @@ class Crew:
 
         Args:
             agent: The agent to be added to the crew.
+
+        Raises:
+            ValueError: If the crew already has an agent with the same name. Names identify the
+                        agents in the context of their dependents, the run history and the
+                        checkpoints.
         """
+        if any(member.name == agent.name for member in self.agents):
+            raise ValueError(f"The crew already has an agent named {agent.name!r}")
         self.agents.append(agent)
 
     @staticmethod
@@ -61,8 +162,9 @@ class Crew:
         Args:
             agent: The agent to be registered.
         """
-        if Crew.current_crew is not None:
-            Crew.current_crew.add_agent(agent)
+        crew = _current_crew.get()
+        if crew is not None:
+            crew.add_agent(agent)
 
     def topological_sort(self):
         """
@@ -102,6 +204,9 @@ class Crew:
         Returns:
             Digraph: A Graphviz Digraph object representing the agent dependencies.
         """
+        # Imported here, so graphviz is only needed to plot the crew
+        from graphviz import Digraph  # type: ignore
+
         dot = Digraph(format="png")  # Set format to PNG for inline display
 
         # Add nodes and edges for each agent in the crew
@@ -111,13 +216,319 @@ class Crew:
                 dot.edge(dependency.name, agent.name)
         return dot
 
-    def run(self):
+    @staticmethod
+    def _hand_over(agent, outputs: dict):
+        """
+        Hands the outputs of an agent's dependencies over to it, right before it runs. They follow
+        the order of its `dependencies` list, whatever the order the dependencies finished in, so
+        its prompt (and checkpoint key) is the same in every mode.
+        """
+        for dependency in agent.dependencies:
+            agent.receive_context(outputs[dependency], source=dependency.name)
+
+    def _checkpointed(self, agent) -> tuple[str | None, object]:
+        """
+        Looks up the checkpoint of an agent, given the context it has received.
+
+        Returns:
+            tuple[str | None, object]: The checkpoint key (None without checkpoints) and the
+                                       checkpointed output, or `MISSING`.
+        """
+        if self.checkpoints is None:
+            return None, MISSING
+        key = agent.checkpoint_key()
+        output = self.checkpoints.get(key)
+        if output is not MISSING:
+            logger.info(
+                "SKIPPING AGENT (checkpointed): %s", agent, extra={"kind": "banner"}
+            )
+        return key, output
+
+    def _record(self, agent, seconds: float, tokens: int, run_stats: dict):
+        run_stats[agent.name] = (seconds, tokens)
+        self.history.record(agent.name, seconds, tokens)
+
+    def _run_agent(self, agent, run_stats: dict) -> str:
+        """
+        Runs an agent, or reuses its checkpointed output if its inputs haven't changed, and
+        records its duration and token usage in `run_stats`. It doesn't hand the output over
+        to the dependents.
+        """
+        key, output = self._checkpointed(agent)
+        if output is not MISSING:
+            run_stats[agent.name] = (0.0, 0)
+            return output
+
+        logger.info("RUNNING AGENT: %s", agent, extra={"kind": "banner"})
+        start = time.perf_counter()
+        with measure_usage() as usage:
+            output = agent.run(notify_dependents=False)
+        self._record(agent, time.perf_counter() - start, usage.tokens, run_stats)
+        if key is not None:
+            self.checkpoints.set(key, output)
+        return output
+
+    def _submit(
+        self, executor, agent, backend: str, run_stats: dict, client_factory=None
+    ) -> Future:
+        """
+        Submits an agent to the executor of the backend. Process workers receive the agent's spec
+        and send its output back, which is recorded and checkpointed here, in the coordinator.
+
+        Returns:
+            Future: The future of the agent's output.
+        """
+        if backend == "thread":
+            # Copy the context so the agent's span is a child of the crew's one
+            return executor.submit(
+                contextvars.copy_context().run, self._run_agent, agent, run_stats
+            )
+
+        future = Future()
+        key, output = self._checkpointed(agent)
+        if output is not MISSING:
+            run_stats[agent.name] = (0.0, 0)
+            future.set_result(output)
+            return future
+
+        def finish(worker_future: Future):
+            try:
+                output, seconds, tokens = worker_future.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            self._record(agent, seconds, tokens, run_stats)
+            if key is not None:
+                self.checkpoints.set(key, output)
+            future.set_result(output)
+
+        logger.info("RUNNING AGENT: %s", agent, extra={"kind": "banner"})
+        worker_future = executor.submit(_run_spec, agent.to_spec(client_factory))
+        worker_future.add_done_callback(finish)
+        return future
+
+    async def _arun_agent(self, agent, run_stats: dict) -> str:
+        """
+        Asynchronous version of `_run_agent`.
+        """
+        key, output = self._checkpointed(agent)
+        if output is not MISSING:
+            run_stats[agent.name] = (0.0, 0)
+            return output
+
+        logger.info("RUNNING AGENT: %s", agent, extra={"kind": "banner"})
+        start = time.perf_counter()
+        with measure_usage() as usage:
+            output = await agent.arun(notify_dependents=False)
+        self._record(agent, time.perf_counter() - start, usage.tokens, run_stats)
+        if key is not None:
+            self.checkpoints.set(key, output)
+        return output
+
+    def _ready_queue(self, sorted_agents: list):
         """
-        Runs all agents in the crew in topologically sorted order.
+        Builds the heap of the agents whose dependencies have finished, and the function pushing
+        them to it. They are popped by priority hint (lowest first), then by estimated remaining
+        path length, then in the order they were added to the crew.
+        """
+        durations = self.history.estimates([agent.name for agent in sorted_agents])
+        lengths = remaining_path_lengths(sorted_agents, durations)
+        order = {agent: position for position, agent in enumerate(sorted_agents)}
+        ready: list = []
+
+        def push(agent):
+            heapq.heappush(
+                ready, (agent.priority, -lengths[agent], order[agent], agent)
+            )
+
+        return ready, push
+
+    def _report(self, sorted_agents: list, run_stats: dict, start: float):
+        self.last_report = critical_path_report(
+            sorted_agents,
+            durations={name: stats[0] for name, stats in run_stats.items()},
+            tokens={name: stats[1] for name, stats in run_stats.items()},
+            makespan=time.perf_counter() - start,
+        )
+        logger.info("%s", self.last_report, extra={"kind": "stop"})
+
+    def run(
+        self, max_workers: int = 1, backend: str = "thread", client_factory=None
+    ) -> dict:
+        """
+        Runs all agents in the crew respecting their dependencies.
+
+        With `max_workers=1` (the default) the agents run one after another in topologically
+        sorted order. With a bigger value, each agent starts as soon as all of its dependencies
+        have finished, with at most `max_workers` agents running at the same time (see
+        `run_concurrent`). In both modes, an agent receives the outputs of its dependencies right
+        before it starts, in the order of its `dependencies` list.
+
+        Args:
+            max_workers (int, optional): The maximum number of agents running concurrently. Defaults to 1.
+            backend (str, optional): "thread" or "process" (see `run_concurrent`). Defaults to "thread".
+            client_factory (Callable | None, optional): With the "process" backend, a picklable function
+                creating the LLM client in the workers. Defaults to None.
+
+        Returns:
+            dict: A dictionary mapping each agent to its output.
+        """
+        if max_workers > 1 or backend != "thread":
+            return self.run_concurrent(max_workers, backend, client_factory)
+
+        sorted_agents = self.topological_sort()
+        outputs = {}
+        run_stats: dict = {}
+        start = time.perf_counter()
+        with span("crew.run", agents=len(self.agents), max_workers=1):
+            for agent in sorted_agents:
+                self._hand_over(agent, outputs)
+                output = outputs[agent] = self._run_agent(agent, run_stats)
+                logger.info("%s", output, extra={"kind": "output"})
+        self._report(sorted_agents, run_stats, start)
+        return outputs
+
+    def run_concurrent(
+        self, max_workers: int = 4, backend: str = "thread", client_factory=None
+    ) -> dict:
+        """
+        Runs the agents concurrently, starting each one as soon as all of its dependencies have finished.
+
+        The context is handed to an agent right before it starts, following the order of its
+        `dependencies` list, so the resulting prompt doesn't depend on which dependency finished first.
+
+        The "thread" backend runs the agents in a thread pool, which suits agents waiting on the LLM.
+        The "process" backend sends them to a pool of worker processes, so CPU-bound tools aren't
+        serialised by the GIL: each agent is re-created in a worker from its `AgentSpec`, and its output
+        is sent back to this process. The agent's tools (and its client, unless `client_factory` is
+        given) must be picklable, and the spans recorded in the workers are not exported.
+
+        Args:
+            max_workers (int, optional): The maximum number of agents running concurrently. Defaults to 4.
+            backend (str, optional): "thread" or "process". Defaults to "thread".
+            client_factory (Callable | None, optional): With the "process" backend, a picklable function
+                creating the LLM client in the workers. Defaults to None (the agents' own clients, or
+                the workers' shared ones).
+
+        Returns:
+            dict: A dictionary mapping each agent to its output.
+
+        Raises:
+            ValueError: If `max_workers` is smaller than 1, the backend is unknown or there's a circular
+                        dependency among the agents.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than or equal to 1")
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown crew backend: {backend}")
+        executor_cls = (
+            ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+        )
+
+        # Fail fast on circular dependencies before running any agent
+        sorted_agents = self.topological_sort()
+
+        pending_dependencies = {agent: len(agent.dependencies) for agent in self.agents}
+        ready, push = self._ready_queue(sorted_agents)
+        for agent in self.agents:
+            if pending_dependencies[agent] == 0:
+                push(agent)
+        outputs: dict = {}
+        running: dict = {}
+        run_stats: dict = {}
+        start = time.perf_counter()
+
+        with (
+            span(
+                "crew.run",
+                agents=len(self.agents),
+                max_workers=max_workers,
+                backend=backend,
+            ),
+            executor_cls(max_workers=max_workers) as executor,
+        ):
+            while ready or running:
+                while ready and len(running) < max_workers:
+                    agent = heapq.heappop(ready)[-1]
+                    self._hand_over(agent, outputs)
+
+                    future = self._submit(
+                        executor, agent, backend, run_stats, client_factory
+                    )
+                    running[future] = agent
 
-        This method executes each agent's run method and prints the results.
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    agent = running.pop(future)
+                    outputs[agent] = future.result()
+                    logger.info("%s", outputs[agent], extra={"kind": "output"})
+
+                    for dependent in agent.dependents:
+                        pending_dependencies[dependent] -= 1
+                        if pending_dependencies[dependent] == 0:
+                            push(dependent)
+
+        self._report(sorted_agents, run_stats, start)
+        return outputs
+
+    async def arun(self, max_concurrency: int | None = None) -> dict:
         """
+        Asynchronous version of `run_concurrent`. Each agent runs as an asyncio task that starts
+        as soon as all of its dependencies have finished.
+
+        Args:
+            max_concurrency (int | None, optional): The maximum number of agents running concurrently.
+                                                    Defaults to None (no limit).
+
+        Returns:
+            dict: A dictionary mapping each agent to its output.
+
+        Raises:
+            ValueError: If `max_concurrency` is smaller than 1 or there's a circular dependency among the agents.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than or equal to 1")
+
+        # Fail fast on circular dependencies before running any agent
         sorted_agents = self.topological_sort()
-        for agent in sorted_agents:
-            fancy_print(f"RUNNING AGENT: {agent}")
-            print(Fore.RED + f"{agent.run()}")
+
+        pending_dependencies = {agent: len(agent.dependencies) for agent in self.agents}
+        ready, push = self._ready_queue(sorted_agents)
+        for agent in self.agents:
+            if pending_dependencies[agent] == 0:
+                push(agent)
+        outputs: dict = {}
+        running: dict = {}
+        run_stats: dict = {}
+        start = time.perf_counter()
+
+        with span("crew.run", agents=len(self.agents), max_workers=max_concurrency):
+            try:
+                while ready or running:
+                    while ready and (
+                        max_concurrency is None or len(running) < max_concurrency
+                    ):
+                        agent = heapq.heappop(ready)[-1]
+                        self._hand_over(agent, outputs)
+
+                        task = asyncio.create_task(self._arun_agent(agent, run_stats))
+                        running[task] = agent
+
+                    done, _ = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        agent = running.pop(task)
+                        outputs[agent] = task.result()
+                        logger.info("%s", outputs[agent], extra={"kind": "output"})
+
+                        for dependent in agent.dependents:
+                            pending_dependencies[dependent] -= 1
+                            if pending_dependencies[dependent] == 0:
+                                push(dependent)
+            finally:
+                for task in running:
+                    task.cancel()
+
+        self._report(sorted_agents, run_stats, start)
+        return outputs
@@ -0,0 +1,179 @@
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+
+from agentic_patterns.utils.cache import LRUCache
+from agentic_patterns.utils.cache import MISSING
+from agentic_patterns.utils.cache import SQLiteCache
+
+# The duration assumed for an agent that never ran, when no agent has a history either
+DEFAULT_DURATION = 1.0
+
+
+@dataclass
+class AgentStats:
+    """
+    The run history of an agent.
+
+    Attributes:
+        seconds (float): The moving average of its run durations.
+        tokens (float): The moving average of the tokens it spent per run.
+        runs (int): The number of recorded runs.
+    """
+
+    seconds: float
+    tokens: float
+    runs: int = 1
+
+
+class DurationHistory:
+    """
+    Records how long each agent (by name) takes and how many tokens it spends, across runs, so
+    the crew can estimate the critical path of its next run.
+
+    Attributes:
+        store (LRUCache | SQLiteCache): Where the stats are kept. A SQLite store keeps them
+                                        across processes.
+        alpha (float): The weight of the newest run in the moving averages.
+    """
+
+    def __init__(
+        self, store: str | LRUCache | SQLiteCache | None = None, alpha: float = 0.3
+    ):
+        if isinstance(store, str):
+            store = SQLiteCache(store)
+        self.store = store if store is not None else LRUCache(maxsize=100_000)
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return f"agent-stats:{name}"
+
+    def get(self, name: str) -> AgentStats | None:
+        """
+        Returns the stats of an agent, or None if it never ran.
+        """
+        stats = self.store.get(self._key(name))
+        return None if stats is MISSING else AgentStats(**stats)
+
+    def record(self, name: str, seconds: float, tokens: int):
+        """
+        Adds a run of an agent to its moving averages.
+
+        Args:
+            name (str): The name of the agent.
+            seconds (float): The duration of the run.
+            tokens (int): The tokens spent by the run.
+        """
+        with self._lock:
+            stats = self.get(name)
+            if stats is None:
+                stats = AgentStats(seconds, tokens)
+            else:
+                stats.seconds += self.alpha * (seconds - stats.seconds)
+                stats.tokens += self.alpha * (tokens - stats.tokens)
+                stats.runs += 1
+            self.store.set(self._key(name), stats.__dict__)
+
+    def estimates(self, names: list[str]) -> dict[str, float]:
+        """
+        Estimates the duration of the agents. Agents without a history are assumed to take
+        the average duration of the others.
+
+        Args:
+            names (list[str]): The names of the agents.
+
+        Returns:
+            dict[str, float]: The estimated seconds of each agent.
+        """
+        known = {}
+        for name in names:
+            stats = self.get(name)
+            if stats is not None:
+                known[name] = stats.seconds
+        default = sum(known.values()) / len(known) if known else DEFAULT_DURATION
+        return {name: known.get(name, default) for name in names}
+
+
+def remaining_path_lengths(agents: list, durations: dict[str, float]) -> dict:
+    """
+    Computes, for each agent, the length of the longest path from its start to the end of the
+    crew (its own duration included): the time the crew needs at least once it starts.
+
+    Args:
+        agents (list[Agent]): The agents, in topological order.
+        durations (dict[str, float]): The (estimated) duration of each agent, by name.
+
+    Returns:
+        dict[Agent, float]: The remaining path length of each agent.
+    """
+    lengths: dict = {}
+    for agent in reversed(agents):
+        downstream = [lengths[dependent] for dependent in agent.dependents]
+        lengths[agent] = durations[agent.name] + max(downstream, default=0.0)
+    return lengths
+
+
+@dataclass
+class CriticalPathReport:
+    """
+    The critical path of a crew run: the chain of dependent agents with the longest total
+    duration, which bounds the run's makespan whatever the concurrency.
+
+    Attributes:
+        path (list[str]): The names of the agents on the critical path, in order.
+        path_seconds (float): The total duration of the critical path.
+        makespan (float): The wall-clock duration of the run.
+        durations (dict[str, float]): The duration of each agent in the run (0 if checkpointed).
+        tokens (dict[str, int]): The tokens spent by each agent in the run.
+    """
+
+    path: list[str]
+    path_seconds: float
+    makespan: float
+    durations: dict[str, float] = field(default_factory=dict)
+    tokens: dict[str, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        path = " -> ".join(
+            f"{name} ({self.durations[name]:.2f}s)" for name in self.path
+        )
+        return (
+            f"Critical path: {path}, {self.path_seconds:.2f}s of a "
+            f"{self.makespan:.2f}s run"
+        )
+
+
+def critical_path_report(
+    agents: list,
+    durations: dict[str, float],
+    tokens: dict[str, int],
+    makespan: float,
+) -> CriticalPathReport:
+    """
+    Finds the critical path of a run, given the actual durations of its agents.
+
+    Args:
+        agents (list[Agent]): The agents, in topological order.
+        durations (dict[str, float]): The duration of each agent, by name.
+        tokens (dict[str, int]): The tokens spent by each agent, by name.
+        makespan (float): The wall-clock duration of the run.
+
+    Returns:
+        CriticalPathReport: The report of the run.
+    """
+    lengths = remaining_path_lengths(agents, durations)
+    path = []
+    candidates = [agent for agent in agents if not agent.dependencies]
+    while candidates:
+        agent = max(candidates, key=lengths.__getitem__)
+        path.append(agent.name)
+        candidates = agent.dependents
+    return CriticalPathReport(
+        path=path,
+        path_seconds=sum(durations[name] for name in path),
+        makespan=makespan,
+        durations=durations,
+        tokens=tokens,
+    )
@@ -1,22 +1,40 @@
-import json
+import asyncio
+import contextvars
+import logging
 import re
-
-from colorama import Fore
-from dotenv import load_dotenv
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import TYPE_CHECKING
 
 from agentic_patterns.tool_pattern.tool import Tool
-from agentic_patterns.tool_pattern.tool import validate_arguments
+from agentic_patterns.tool_pattern.tool_executor import execute_tool_calls
+from agentic_patterns.tool_pattern.tool_executor import prepare_tool_calls
+from agentic_patterns.tool_pattern.tool_executor import run_tool_calls
+from agentic_patterns.utils.clients import get_async_client
+from agentic_patterns.utils.clients import get_client
+from agentic_patterns.utils.completions import acompletions_create
+from agentic_patterns.utils.completions import acompletions_stream
 from agentic_patterns.utils.completions import build_prompt_structure
 from agentic_patterns.utils.completions import ChatHistory
 from agentic_patterns.utils.completions import completions_create
+from agentic_patterns.utils.completions import completions_stream
+from agentic_patterns.utils.completions import TokenBudgetChatHistory
 from agentic_patterns.utils.completions import update_chat_history
-from agentic_patterns.utils.extraction import extract_tag_content
+from agentic_patterns.utils.extraction import extract_tags
+from agentic_patterns.utils.extraction import TagContentResult
+from agentic_patterns.utils.extraction import TagParser
+from agentic_patterns.utils.tracing import span
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+    from groq import Groq
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 BASE_SYSTEM_PROMPT = ""
 
+REACT_TAGS = ("response", "thought", "tool_call")
+
 
 REACT_SYSTEM_PROMPT = """
 You operate by running a loop with the following steps: Thought, Action, Observation.
@@ -64,9 +82,14 @@ class ReactAgent:
 
     Attributes:
         client (Groq): The Groq client used to handle model-based completions.
+        async_client (AsyncGroq): The AsyncGroq client used by `arun`.
         model (str): The name of the model used for generating responses. Default is "llama-3.3-70b-versatile".
         tools (list[Tool]): A list of Tool instances available for execution.
         tools_dict (dict): A dictionary mapping tool names to their corresponding Tool instances.
+        max_tool_workers (int): The maximum number of tool calls executed concurrently in one round.
+        tool_timeout (float | None): Default maximum number of seconds for each tool call.
+        max_history_tokens (int | None): If set, the estimated token budget of the chat history. The oldest
+                                         rounds are evicted first, the system prompt and question are always kept.
     """
 
     def __init__(
@@ -74,12 +97,50 @@ class ReactAgent:
         tools: Tool | list[Tool],
         model: str = "llama-3.3-70b-versatile",
         system_prompt: str = BASE_SYSTEM_PROMPT,
+        max_tool_workers: int = 1,
+        tool_timeout: float | None = None,
+        client: "Groq | None" = None,
+        async_client: "AsyncGroq | None" = None,
+        max_history_tokens: int | None = None,
     ) -> None:
-        self.client = Groq()
+        self._client = client
+        self._async_client = async_client
+        self.max_history_tokens = max_history_tokens
         self.model = model
         self.system_prompt = system_prompt
         self.tools = tools if isinstance(tools, list) else [tools]
         self.tools_dict = {tool.name: tool for tool in self.tools}
+        self._system_prompt_key: tuple | None = None
+        self._compiled_system_prompt = ""
+        self.compile_system_prompt()
+        self.max_tool_workers = max_tool_workers
+        self.tool_timeout = tool_timeout
+
+    @property
+    def client(self) -> "Groq":
+        """
+        Returns the injected Groq client or, if none was given, the process-wide shared one
+        from `agentic_patterns.utils.clients`.
+        """
+        return self._client if self._client is not None else get_client()
+
+    @client.setter
+    def client(self, client: "Groq | None"):
+        self._client = client
+
+    @property
+    def async_client(self) -> "AsyncGroq":
+        """
+        Returns the injected AsyncGroq client or, if none was given, the shared one
+        bound to the running event loop.
+        """
+        return (
+            self._async_client if self._async_client is not None else get_async_client()
+        )
+
+    @async_client.setter
+    def async_client(self, async_client: "AsyncGroq | None"):
+        self._async_client = async_client
 
     def add_tool_signatures(self) -> str:
         """
@@ -90,42 +151,289 @@ class ReactAgent:
         """
         return "".join([tool.fn_signature for tool in self.tools])
 
+    def compile_system_prompt(self) -> str:
+        """
+        Returns the system prompt of the agent: the user-provided system prompt followed by
+        the ReAct instructions and the tool signatures.
+
+        The prompt is built once and reused (byte for byte) across runs, so providers can reuse their
+        prompt prefix caches. It's only rebuilt when the tools (or the system prompt) change.
+
+        Returns:
+            str: The compiled system prompt.
+        """
+        key = (self.system_prompt, tuple(self.tools))
+        if key != self._system_prompt_key:
+            self.tools_dict = {tool.name: tool for tool in self.tools}
+            system_prompt = self.system_prompt
+            if self.tools:
+                system_prompt += "\n" + REACT_SYSTEM_PROMPT % self.add_tool_signatures()
+            self._compiled_system_prompt = system_prompt
+            self._system_prompt_key = key
+        return self._compiled_system_prompt
+
     def process_tool_calls(self, tool_calls_content: list) -> dict:
         """
         Processes each tool call, validates arguments, executes the tools, and collects results.
 
+        When `max_tool_workers` is greater than 1, the tool calls run concurrently. A failing or
+        timed out call produces an error observation instead of aborting the whole turn.
+
         Args:
             tool_calls_content (list): List of strings, each representing a tool call in JSON format.
 
         Returns:
             dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
         """
-        observations = {}
-        for tool_call_str in tool_calls_content:
-            tool_call = json.loads(tool_call_str)
-            tool_name = tool_call["name"]
-            tool = self.tools_dict[tool_name]
+        return execute_tool_calls(
+            self.tools_dict,
+            tool_calls_content,
+            max_workers=self.max_tool_workers,
+            timeout=self.tool_timeout,
+        )
+
+    def _build_chat_history(
+        self, user_msg: str
+    ) -> ChatHistory | TokenBudgetChatHistory:
+        """
+        Builds the initial chat history, made of the system prompt and the user's question.
+
+        Args:
+            user_msg (str): The user's input message to start the interaction.
+
+        Returns:
+            ChatHistory | TokenBudgetChatHistory: The initial chat history, token-budgeted if
+                                                  `max_history_tokens` is set.
+        """
+        user_prompt = build_prompt_structure(
+            prompt=user_msg, role="user", tag="question"
+        )
+        messages = [
+            build_prompt_structure(
+                prompt=self.compile_system_prompt(),
+                role="system",
+            ),
+            user_prompt,
+        ]
+        if self.max_history_tokens is not None:
+            return TokenBudgetChatHistory(
+                messages, max_tokens=self.max_history_tokens, n_pinned=2
+            )
+        return ChatHistory(messages)
+
+    def _parse_completion(
+        self,
+        completion: str,
+        chat_history: ChatHistory,
+        tags: dict[str, TagContentResult] | None = None,
+    ) -> tuple[TagContentResult, TagContentResult | None]:
+        """
+        Parses a completion of the ReAct loop, updating the chat history when no final response was found.
+
+        Args:
+            completion (str): The completion returned by the model.
+            chat_history (ChatHistory): The chat history of the current session.
+            tags (dict[str, TagContentResult] | None, optional): The tags already extracted from the completion,
+                                                                  if any. Defaults to None.
+
+        Returns:
+            tuple[TagContentResult, TagContentResult | None]: The extracted response and tool calls. The tool
+                                                               calls are None when a final response was found.
+        """
+        if tags is None:
+            tags = extract_tags(completion, REACT_TAGS)
+
+        response = tags["response"]
+        if response.found:
+            return response, None
+
+        update_chat_history(chat_history, completion, "assistant")
+
+        if tags["thought"].found:
+            logger.info(
+                "Thought: %s", tags["thought"].content[0], extra={"kind": "thought"}
+            )
+
+        return response, tags["tool_call"]
+
+    def _stream_round(
+        self, chat_history: ChatHistory
+    ) -> tuple[str, dict[str, TagContentResult], dict]:
+        """
+        Runs a round of the ReAct loop on a streamed completion. Each tool call starts running as soon
+        as its </tool_call> tag closes, and the round ends right away once a <response> block is complete.
 
-            print(Fore.GREEN + f"\nUsing Tool: {tool_name}")
+        Args:
+            chat_history (ChatHistory): The chat history of the current session.
+
+        Returns:
+            tuple[str, dict[str, TagContentResult], dict]: The completion, the tags extracted from it
+                                                           and the observations of the tool calls.
+        """
+        parser = TagParser(REACT_TAGS)
+        observations: dict = {}
+        n_calls = 0
+        futures = []
+        executor = ThreadPoolExecutor(max_workers=max(self.max_tool_workers, 1))
+        try:
+            for chunk in completions_stream(self.client, chat_history, self.model):
+                for tag, content in parser.feed(chunk):
+                    if tag == "response":
+                        return parser.text, parser.results(), {}
+
+                    if tag == "tool_call":
+                        # Validated here, so its ID is checked against the whole turn
+                        calls = prepare_tool_calls(
+                            self.tools_dict,
+                            [content],
+                            observations,
+                            self.tool_timeout,
+                            n_calls,
+                        )
+                        n_calls += 1
+                        if calls:
+                            future = executor.submit(
+                                contextvars.copy_context().run, run_tool_calls, calls
+                            )
+                            futures.append(future)
+
+            for future in futures:
+                observations.update(future.result())
+            return parser.text, parser.results(), observations
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _astream_round(
+        self, chat_history: ChatHistory
+    ) -> tuple[str, dict[str, TagContentResult], dict]:
+        """
+        Asynchronous version of `_stream_round`. Tool calls run in worker threads, at most
+        `max_tool_workers` at a time.
+
+        Args:
+            chat_history (ChatHistory): The chat history of the current session.
+
+        Returns:
+            tuple[str, dict[str, TagContentResult], dict]: The completion, the tags extracted from it
+                                                           and the observations of the tool calls.
+        """
+        semaphore = asyncio.Semaphore(max(self.max_tool_workers, 1))
+
+        async def run_tool_call(calls: list[tuple]) -> dict:
+            async with semaphore:
+                return await asyncio.to_thread(run_tool_calls, calls)
+
+        parser = TagParser(REACT_TAGS)
+        observations: dict = {}
+        n_calls = 0
+        tasks: list[asyncio.Task] = []
+        try:
+            stream = acompletions_stream(self.async_client, chat_history, self.model)
+            async with aclosing(stream):
+                async for chunk in stream:
+                    for tag, content in parser.feed(chunk):
+                        if tag == "response":
+                            return parser.text, parser.results(), {}
+
+                        if tag == "tool_call":
+                            # Validated here, so its ID is checked against the whole turn
+                            calls = prepare_tool_calls(
+                                self.tools_dict,
+                                [content],
+                                observations,
+                                self.tool_timeout,
+                                n_calls,
+                            )
+                            n_calls += 1
+                            if calls:
+                                tasks.append(asyncio.create_task(run_tool_call(calls)))
+
+            for result in await asyncio.gather(*tasks):
+                observations.update(result)
+            return parser.text, parser.results(), observations
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _run_round(self, chat_history: ChatHistory, stream: bool = False) -> str | None:
+        """
+        Runs a round of the ReAct loop: requests a completion and runs the tool calls it contains.
 
-            # Validate and execute the tool call
-            validated_tool_call = validate_arguments(
-                tool_call, json.loads(tool.fn_signature)
+        Args:
+            chat_history (ChatHistory): The chat history of the current session.
+            stream (bool, optional): Whether to stream the completion. Default is False.
+
+        Returns:
+            str | None: The final response, or None if the loop must go on.
+        """
+        if stream:
+            completion, tags, observations = self._stream_round(chat_history)
+            response, _ = self._parse_completion(completion, chat_history, tags)
+            if response.found:
+                return response.content[0]
+
+        else:
+            completion = completions_create(self.client, chat_history, self.model)
+            response, tool_calls = self._parse_completion(completion, chat_history)
+            if response.found:
+                return response.content[0]
+
+            observations = (
+                self.process_tool_calls(tool_calls.content) if tool_calls.found else {}
             )
-            print(Fore.GREEN + f"\nTool call dict: \n{validated_tool_call}")
 
-            result = tool.run(**validated_tool_call["arguments"])
-            print(Fore.GREEN + f"\nTool result: \n{result}")
+        if observations:
+            logger.debug(
+                "Observations: %s", observations, extra={"kind": "observation"}
+            )
+            update_chat_history(chat_history, f"{observations}", "user")
+        return None
+
+    async def _arun_round(
+        self, chat_history: ChatHistory, stream: bool = False
+    ) -> str | None:
+        """
+        Asynchronous version of `_run_round`.
 
-            # Store the result using the tool call ID
-            observations[validated_tool_call["id"]] = result
+        Args:
+            chat_history (ChatHistory): The chat history of the current session.
+            stream (bool, optional): Whether to stream the completion. Default is False.
+
+        Returns:
+            str | None: The final response, or None if the loop must go on.
+        """
+        if stream:
+            completion, tags, observations = await self._astream_round(chat_history)
+            response, _ = self._parse_completion(completion, chat_history, tags)
+            if response.found:
+                return response.content[0]
+
+        else:
+            completion = await acompletions_create(
+                self.async_client, chat_history, self.model
+            )
+            response, tool_calls = self._parse_completion(completion, chat_history)
+            if response.found:
+                return response.content[0]
+
+            observations = (
+                await asyncio.to_thread(self.process_tool_calls, tool_calls.content)
+                if tool_calls.found
+                else {}
+            )
 
-        return observations
+        if observations:
+            logger.debug(
+                "Observations: %s", observations, extra={"kind": "observation"}
+            )
+            update_chat_history(chat_history, f"{observations}", "user")
+        return None
 
     def run(
         self,
         user_msg: str,
         max_rounds: int = 10,
+        stream: bool = False,
     ) -> str:
         """
         Executes a user interaction session, where the agent processes user input, generates responses,
@@ -135,48 +443,55 @@ class ReactAgent:
         Args:
             user_msg (str): The user's input message to start the interaction.
             max_rounds (int, optional): Maximum number of interaction rounds the agent should perform. Default is 10.
+            stream (bool, optional): Whether to stream the completions, starting each tool call as soon as
+                                     it's complete and returning as soon as the response is. Default is False.
 
         Returns:
             str: The final response generated by the agent after processing user input and any tool calls.
         """
-        user_prompt = build_prompt_structure(
-            prompt=user_msg, role="user", tag="question"
-        )
-        if self.tools:
-            self.system_prompt += (
-                "\n" + REACT_SYSTEM_PROMPT % self.add_tool_signatures()
-            )
+        chat_history = self._build_chat_history(user_msg)
 
-        chat_history = ChatHistory(
-            [
-                build_prompt_structure(
-                    prompt=self.system_prompt,
-                    role="system",
-                ),
-                user_prompt,
-            ]
-        )
-
-        if self.tools:
-            # Run the ReAct loop for max_rounds
-            for _ in range(max_rounds):
-
-                completion = completions_create(self.client, chat_history, self.model)
+        with span("react.run", model=self.model, tools=len(self.tools)):
+            if self.tools:
+                # Run the ReAct loop for max_rounds
+                for round_ in range(max_rounds):
+                    with span("react.round", round=round_):
+                        response = self._run_round(chat_history, stream)
+                    if response is not None:
+                        return response
 
-                response = extract_tag_content(str(completion), "response")
-                if response.found:
-                    return response.content[0]
+            return completions_create(self.client, chat_history, self.model)
 
-                thought = extract_tag_content(str(completion), "thought")
-                tool_calls = extract_tag_content(str(completion), "tool_call")
-
-                update_chat_history(chat_history, completion, "assistant")
-
-                print(Fore.MAGENTA + f"\nThought: {thought.content[0]}")
+    async def arun(
+        self,
+        user_msg: str,
+        max_rounds: int = 10,
+        stream: bool = False,
+    ) -> str:
+        """
+        Asynchronous version of `run`. The LLM calls go through the async client and the tools,
+        which are regular functions, run in a worker thread so they don't block the event loop.
 
-                if tool_calls.found:
-                    observations = self.process_tool_calls(tool_calls.content)
-                    print(Fore.BLUE + f"\nObservations: {observations}")
-                    update_chat_history(chat_history, f"{observations}", "user")
+        Args:
+            user_msg (str): The user's input message to start the interaction.
+            max_rounds (int, optional): Maximum number of interaction rounds the agent should perform. Default is 10.
+            stream (bool, optional): Whether to stream the completions, starting each tool call as soon as
+                                     it's complete and returning as soon as the response is. Default is False.
 
-        return completions_create(self.client, chat_history, self.model)
+        Returns:
+            str: The final response generated by the agent after processing user input and any tool calls.
+        """
+        chat_history = self._build_chat_history(user_msg)
+
+        with span("react.run", model=self.model, tools=len(self.tools)):
+            if self.tools:
+                # Run the ReAct loop for max_rounds
+                for round_ in range(max_rounds):
+                    with span("react.round", round=round_):
+                        response = await self._arun_round(chat_history, stream)
+                    if response is not None:
+                        return response
+
+            return await acompletions_create(
+                self.async_client, chat_history, self.model
+            )
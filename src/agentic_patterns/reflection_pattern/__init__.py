@@ -1 +1,2 @@
-from .reflection_agent import ReflectionAgent
\ No newline at end of file
+from .reflection_agent import ReflectionAgent
+from .stopping import StoppingCriteria
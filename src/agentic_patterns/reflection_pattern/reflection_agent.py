@@ -1,14 +1,35 @@
-from colorama import Fore
-from dotenv import load_dotenv
-from groq import Groq
+import asyncio
+import contextvars
+import logging
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
 
+from agentic_patterns.reflection_pattern.stopping import StoppingCriteria
+from agentic_patterns.utils.clients import get_async_client
+from agentic_patterns.utils.clients import get_client
+from agentic_patterns.utils.completions import acompletions_create
 from agentic_patterns.utils.completions import build_prompt_structure
 from agentic_patterns.utils.completions import completions_create
 from agentic_patterns.utils.completions import FixedFirstChatHistory
 from agentic_patterns.utils.completions import update_chat_history
 from agentic_patterns.utils.logging import fancy_step_tracker
+from agentic_patterns.utils.tokens import estimate_messages_tokens
+from agentic_patterns.utils.tokens import estimate_tokens
+from agentic_patterns.utils.tracing import span
 
-load_dotenv()
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+    from groq import Groq
+
+logger = logging.getLogger(__name__)
 
 
 BASE_GENERATION_SYSTEM_PROMPT = """
@@ -24,6 +45,53 @@ and critiques. If the user content is ok and there's nothing to change, output t
 """
 
 
+@dataclass
+class BatchResult:
+    """
+    The outcome of one item of `ReflectionAgent.run_batch`.
+
+    Attributes:
+        index (int): The position of the message in the batch.
+        user_msg (str): The user message.
+        output (str | None): The final generation, or None if the item failed.
+        error (Exception | None): The exception raised while processing the item, if any.
+    """
+
+    index: int
+    user_msg: str
+    output: str | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _LoopState:
+    """
+    The state of a generate-reflect loop, shared by `run` and `arun`.
+    """
+
+    generation_history: FixedFirstChatHistory
+    reflection_history: FixedFirstChatHistory
+    stopping: StoppingCriteria
+    start: float = field(default_factory=time.perf_counter)
+    tokens: int = 0
+    previous: str | None = None
+
+
+def _stop(step_span, reason: str | None) -> bool:
+    """
+    Records the reason for stopping the loop, if any, and tells whether to stop.
+    """
+    if not reason:
+        return False
+    step_span.set_attribute("stop_reason", reason)
+    logger.info("%s. Stopping the reflection loop ...", reason, extra={"kind": "stop"})
+    return True
+
+
 class ReflectionAgent:
     """
     A class that implements a Reflection Agent, which generates responses and reflects
@@ -31,35 +99,105 @@ class ReflectionAgent:
     responses based on provided prompts and then critiques them in a reflection step.
 
     Attributes:
-        model (str): The model name used for generating and reflecting on responses.
+        model (str): The model name used for generating responses.
+        reflection_model (str): The model name used for reflecting on responses. Critiquing is usually
+                                easier than generating, so a smaller, faster model often does the job.
+                                Defaults to `model`.
         client (Groq): An instance of the Groq client to interact with the language model.
+        async_client (AsyncGroq): An instance of the AsyncGroq client, used by the async methods.
     """
 
-    def __init__(self, model: str = "llama-3.3-70b-versatile"):
-        self.client = Groq()
+    def __init__(
+        self,
+        model: str = "llama-3.3-70b-versatile",
+        client: "Groq | None" = None,
+        async_client: "AsyncGroq | None" = None,
+        reflection_model: str | None = None,
+    ):
+        self._client = client
+        self._async_client = async_client
         self.model = model
+        self.reflection_model = reflection_model or model
+
+    @property
+    def client(self) -> "Groq":
+        """
+        Returns the injected Groq client or, if none was given, the process-wide shared one
+        from `agentic_patterns.utils.clients`.
+        """
+        return self._client if self._client is not None else get_client()
+
+    @client.setter
+    def client(self, client: "Groq | None"):
+        self._client = client
+
+    @property
+    def async_client(self) -> "AsyncGroq":
+        """
+        Returns the injected AsyncGroq client or, if none was given, the shared one
+        bound to the running event loop.
+        """
+        return (
+            self._async_client if self._async_client is not None else get_async_client()
+        )
+
+    @async_client.setter
+    def async_client(self, async_client: "AsyncGroq | None"):
+        self._async_client = async_client
 
     def _request_completion(
         self,
         history: list,
         verbose: int = 0,
         log_title: str = "COMPLETION",
-        log_color: str = "",
+        log_kind: str = "generation",
+        model: str | None = None,
     ):
         """
         A private method to request a completion from the Groq model.
 
         Args:
             history (list): A list of messages forming the conversation or reflection history.
-            verbose (int, optional): The verbosity level. Defaults to 0 (no output).
+            verbose (int, optional): The verbosity level. Defaults to 0 (no output). Above 0, the completion
+                                     is logged at the INFO level.
+            model (str | None, optional): The model to use. Defaults to the generation model.
+
+        Returns:
+            str: The model-generated response.
+        """
+        output = completions_create(self.client, history, model or self.model)
+
+        if verbose > 0:
+            logger.info("%s\n\n%s", log_title, output, extra={"kind": log_kind})
+
+        return output
+
+    async def _arequest_completion(
+        self,
+        history: list,
+        verbose: int = 0,
+        log_title: str = "COMPLETION",
+        log_kind: str = "generation",
+        model: str | None = None,
+    ):
+        """
+        Asynchronous version of `_request_completion`.
+
+        Args:
+            history (list): A list of messages forming the conversation or reflection history.
+            verbose (int, optional): The verbosity level. Defaults to 0 (no output). Above 0, the completion
+                                     is logged at the INFO level.
+            model (str | None, optional): The model to use. Defaults to the generation model.
 
         Returns:
             str: The model-generated response.
         """
-        output = completions_create(self.client, history, self.model)
+        output = await acompletions_create(
+            self.async_client, history, model or self.model
+        )
 
         if verbose > 0:
-            print(log_color, f"\n\n{log_title}\n\n", output)
+            logger.info("%s\n\n%s", log_title, output, extra={"kind": log_kind})
 
         return output
 
@@ -69,13 +207,13 @@ class ReflectionAgent:
 
         Args:
             generation_history (list): A list of messages forming the conversation or generation history.
-            verbose (int, optional): The verbosity level, controlling printed output. Defaults to 0.
+            verbose (int, optional): The verbosity level, controlling the logged output. Defaults to 0.
 
         Returns:
             str: The generated response.
         """
         return self._request_completion(
-            generation_history, verbose, log_title="GENERATION", log_color=Fore.BLUE
+            generation_history, verbose, log_title="GENERATION", log_kind="generation"
         )
 
     def reflect(self, reflection_history: list, verbose: int = 0) -> str:
@@ -85,36 +223,72 @@ class ReflectionAgent:
         Args:
             reflection_history (list): A list of messages forming the reflection history, typically based on
                                        the previous generation or interaction.
-            verbose (int, optional): The verbosity level, controlling printed output. Defaults to 0.
+            verbose (int, optional): The verbosity level, controlling the logged output. Defaults to 0.
 
         Returns:
             str: The critique or reflection response from the model.
         """
         return self._request_completion(
-            reflection_history, verbose, log_title="REFLECTION", log_color=Fore.GREEN
+            reflection_history,
+            verbose,
+            log_title="REFLECTION",
+            log_kind="reflection",
+            model=self.reflection_model,
         )
 
-    def run(
+    async def agenerate(self, generation_history: list, verbose: int = 0) -> str:
+        """
+        Asynchronous version of `generate`.
+
+        Args:
+            generation_history (list): A list of messages forming the conversation or generation history.
+            verbose (int, optional): The verbosity level, controlling the logged output. Defaults to 0.
+
+        Returns:
+            str: The generated response.
+        """
+        return await self._arequest_completion(
+            generation_history, verbose, log_title="GENERATION", log_kind="generation"
+        )
+
+    async def areflect(self, reflection_history: list, verbose: int = 0) -> str:
+        """
+        Asynchronous version of `reflect`.
+
+        Args:
+            reflection_history (list): A list of messages forming the reflection history, typically based on
+                                       the previous generation or interaction.
+            verbose (int, optional): The verbosity level, controlling the logged output. Defaults to 0.
+
+        Returns:
+            str: The critique or reflection response from the model.
+        """
+        return await self._arequest_completion(
+            reflection_history,
+            verbose,
+            log_title="REFLECTION",
+            log_kind="reflection",
+            model=self.reflection_model,
+        )
+
+    def _start_loop(
         self,
         user_msg: str,
-        generation_system_prompt: str = "",
-        reflection_system_prompt: str = "",
-        n_steps: int = 10,
-        verbose: int = 0,
-    ) -> str:
+        generation_system_prompt: str,
+        reflection_system_prompt: str,
+        stopping: StoppingCriteria | None,
+    ) -> _LoopState:
         """
-        Runs the ReflectionAgent over multiple steps, alternating between generating a response
-        and reflecting on it for the specified number of steps.
+        Starts a generate-reflect loop, building its generation and reflection chat histories.
 
         Args:
             user_msg (str): The user message or query that initiates the interaction.
-            generation_system_prompt (str, optional): The system prompt for guiding the generation process.
-            reflection_system_prompt (str, optional): The system prompt for guiding the reflection process.
-            n_steps (int, optional): The number of generate-reflect cycles to perform. Defaults to 3.
-            verbose (int, optional): The verbosity level controlling printed output. Defaults to 0.
+            generation_system_prompt (str): The system prompt for guiding the generation process.
+            reflection_system_prompt (str): The system prompt for guiding the reflection process.
+            stopping (StoppingCriteria | None): When to end the loop early.
 
         Returns:
-            str: The final generated response after all cycles are completed.
+            _LoopState: The state of the new loop.
         """
         generation_system_prompt += BASE_GENERATION_SYSTEM_PROMPT
         reflection_system_prompt += BASE_REFLECTION_SYSTEM_PROMPT
@@ -136,28 +310,256 @@ class ReflectionAgent:
             [build_prompt_structure(prompt=reflection_system_prompt, role="system")],
             total_length=3,
         )
+        return _LoopState(
+            generation_history, reflection_history, stopping or StoppingCriteria()
+        )
+
+    def _after_generation(self, state: _LoopState, generation: str, step_span) -> bool:
+        """
+        Accounts for a generation and passes it on to the reflection.
+
+        Args:
+            state (_LoopState): The state of the loop.
+            generation (str): The new generation.
+            step_span (Span): The span of the current step.
+
+        Returns:
+            bool: Whether the loop must stop.
+        """
+        state.tokens += estimate_messages_tokens(state.generation_history)
+        state.tokens += estimate_tokens(generation)
+
+        # Stopping here, e.g. when the text has converged, saves the reflection call
+        reason = state.stopping.after_generation(
+            state.previous, generation, time.perf_counter() - state.start, state.tokens
+        )
+        if _stop(step_span, reason):
+            return True
+
+        update_chat_history(state.generation_history, generation, "assistant")
+        update_chat_history(state.reflection_history, generation, "user")
+        state.previous = generation
+        return False
+
+    def _after_reflection(self, state: _LoopState, critique: str, step_span) -> bool:
+        """
+        Accounts for a critique and passes it on to the next generation.
+
+        Args:
+            state (_LoopState): The state of the loop.
+            critique (str): The new critique.
+            step_span (Span): The span of the current step.
+
+        Returns:
+            bool: Whether the loop must stop.
+        """
+        state.tokens += estimate_messages_tokens(state.reflection_history)
+        state.tokens += estimate_tokens(critique)
+
+        # If no additional suggestions are made, stop the loop
+        reason = state.stopping.after_reflection(
+            critique, time.perf_counter() - state.start, state.tokens
+        )
+        if _stop(step_span, reason):
+            return True
+
+        update_chat_history(state.generation_history, critique, "user")
+        update_chat_history(state.reflection_history, critique, "assistant")
+        return False
+
+    def run(
+        self,
+        user_msg: str,
+        generation_system_prompt: str = "",
+        reflection_system_prompt: str = "",
+        n_steps: int = 10,
+        verbose: int = 0,
+        stopping: StoppingCriteria | None = None,
+    ) -> str:
+        """
+        Runs the ReflectionAgent over multiple steps, alternating between generating a response
+        and reflecting on it for the specified number of steps.
+
+        Args:
+            user_msg (str): The user message or query that initiates the interaction.
+            generation_system_prompt (str, optional): The system prompt for guiding the generation process.
+            reflection_system_prompt (str, optional): The system prompt for guiding the reflection process.
+            n_steps (int, optional): The number of generate-reflect cycles to perform. Defaults to 3.
+            verbose (int, optional): The verbosity level controlling the logged output. Defaults to 0.
+            stopping (StoppingCriteria | None, optional): When to end the loop early. Defaults to stopping
+                                                          only when the critique contains `<OK>`.
+
+        Returns:
+            str: The final generated response after all cycles are completed.
+        """
+        state = self._start_loop(
+            user_msg, generation_system_prompt, reflection_system_prompt, stopping
+        )
+
+        for step in range(n_steps):
+            with span("reflection.step", step=step) as step_span:
+                if verbose > 0:
+                    fancy_step_tracker(step, n_steps)
+
+                generation = self.generate(state.generation_history, verbose=verbose)
+                if self._after_generation(state, generation, step_span):
+                    break
+
+                critique = self.reflect(state.reflection_history, verbose=verbose)
+                if self._after_reflection(state, critique, step_span):
+                    break
+
+        return generation
+
+    async def arun(
+        self,
+        user_msg: str,
+        generation_system_prompt: str = "",
+        reflection_system_prompt: str = "",
+        n_steps: int = 10,
+        verbose: int = 0,
+        stopping: StoppingCriteria | None = None,
+    ) -> str:
+        """
+        Asynchronous version of `run`, using the async client for every generate-reflect cycle.
+
+        Args:
+            user_msg (str): The user message or query that initiates the interaction.
+            generation_system_prompt (str, optional): The system prompt for guiding the generation process.
+            reflection_system_prompt (str, optional): The system prompt for guiding the reflection process.
+            n_steps (int, optional): The number of generate-reflect cycles to perform. Defaults to 10.
+            verbose (int, optional): The verbosity level controlling the logged output. Defaults to 0.
+            stopping (StoppingCriteria | None, optional): When to end the loop early. Defaults to stopping
+                                                          only when the critique contains `<OK>`.
+
+        Returns:
+            str: The final generated response after all cycles are completed.
+        """
+        state = self._start_loop(
+            user_msg, generation_system_prompt, reflection_system_prompt, stopping
+        )
 
         for step in range(n_steps):
-            if verbose > 0:
-                fancy_step_tracker(step, n_steps)
-
-            # Generate the response
-            generation = self.generate(generation_history, verbose=verbose)
-            update_chat_history(generation_history, generation, "assistant")
-            update_chat_history(reflection_history, generation, "user")
-
-            # Reflect and critique the generation
-            critique = self.reflect(reflection_history, verbose=verbose)
-
-            if "<OK>" in critique:
-                # If no additional suggestions are made, stop the loop
-                print(
-                    Fore.RED,
-                    "\n\nStop Sequence found. Stopping the reflection loop ... \n\n",
+            with span("reflection.step", step=step) as step_span:
+                if verbose > 0:
+                    fancy_step_tracker(step, n_steps)
+
+                generation = await self.agenerate(
+                    state.generation_history, verbose=verbose
                 )
-                break
+                if self._after_generation(state, generation, step_span):
+                    break
 
-            update_chat_history(generation_history, critique, "user")
-            update_chat_history(reflection_history, critique, "assistant")
+                critique = await self.areflect(
+                    state.reflection_history, verbose=verbose
+                )
+                if self._after_reflection(state, critique, step_span):
+                    break
 
         return generation
+
+    def _run_item(self, index: int, user_msg: str, run_kwargs: dict) -> BatchResult:
+        try:
+            return BatchResult(index, user_msg, output=self.run(user_msg, **run_kwargs))
+        except Exception as e:
+            return BatchResult(index, user_msg, error=e)
+
+    async def _arun_item(
+        self, index: int, user_msg: str, run_kwargs: dict
+    ) -> BatchResult:
+        try:
+            output = await self.arun(user_msg, **run_kwargs)
+            return BatchResult(index, user_msg, output=output)
+        except Exception as e:
+            return BatchResult(index, user_msg, error=e)
+
+    def run_batch(
+        self,
+        user_msgs: Iterable[str],
+        max_workers: int = 8,
+        **run_kwargs,
+    ) -> Iterator[BatchResult]:
+        """
+        Runs the generate-reflect loop over many messages concurrently, in a thread pool.
+
+        The messages are consumed lazily, so at most `max_workers` of them are in flight at any time,
+        whatever the size of the batch. Results are yielded as soon as each item finishes (not in
+        the input order; use `BatchResult.index` to match them), and an item that fails is reported
+        in its `BatchResult.error` without stopping the others.
+
+        Args:
+            user_msgs (Iterable[str]): The user messages to process.
+            max_workers (int, optional): The maximum number of messages processed concurrently. Defaults to 8.
+            **run_kwargs: Keyword arguments passed to `run` for every message (e.g. `n_steps`).
+
+        Yields:
+            BatchResult: The result of each message, in completion order.
+        """
+        messages = enumerate(user_msgs)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        running = set()
+        try:
+            while True:
+                for index, user_msg in messages:
+                    running.add(
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            self._run_item,
+                            index,
+                            user_msg,
+                            run_kwargs,
+                        )
+                    )
+                    if len(running) >= max_workers:
+                        break
+                if not running:
+                    return
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # If the caller stops iterating early, don't start the remaining messages
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def arun_batch(
+        self,
+        user_msgs: Iterable[str],
+        max_concurrency: int = 8,
+        **run_kwargs,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Asynchronous version of `run_batch`: up to `max_concurrency` generate-reflect loops run as
+        tasks on the current event loop.
+
+        Args:
+            user_msgs (Iterable[str]): The user messages to process.
+            max_concurrency (int, optional): The maximum number of messages processed concurrently. Defaults to 8.
+            **run_kwargs: Keyword arguments passed to `arun` for every message (e.g. `n_steps`).
+
+        Yields:
+            BatchResult: The result of each message, in completion order.
+        """
+        messages = enumerate(user_msgs)
+        running: set[asyncio.Task] = set()
+        try:
+            while True:
+                for index, user_msg in messages:
+                    running.add(
+                        asyncio.create_task(
+                            self._arun_item(index, user_msg, run_kwargs)
+                        )
+                    )
+                    if len(running) >= max_concurrency:
+                        break
+                if not running:
+                    return
+
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in running:
+                task.cancel()
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+
+def generation_similarity(previous: str, current: str) -> float:
+    """
+    Measures how similar two consecutive generations are, between 0 (nothing in common) and 1
+    (identical), using `difflib`'s ratio.
+
+    Args:
+        previous (str): The previous generation.
+        current (str): The new generation.
+
+    Returns:
+        float: The similarity ratio.
+    """
+    if previous == current:
+        return 1.0
+    return SequenceMatcher(None, previous, current).ratio()
+
+
+@dataclass
+class StoppingCriteria:
+    """
+    The conditions that end a reflection loop before its `n_steps`. Every criterion is optional,
+    except the stop sequence the reflection prompt asks the critic to output.
+
+    Attributes:
+        stop_sequence (str): The critic's way of saying there's nothing left to improve.
+        similarity_threshold (float | None): Stop when two consecutive generations are at least this
+                                             similar (see `generation_similarity`), e.g. 0.95.
+        min_critique_length (int | None): Stop when the critique is shorter than this number of
+                                          characters, as short critiques are usually nitpicks.
+        max_seconds (float | None): The wall-clock budget of the whole loop.
+        max_tokens (int | None): The budget of (estimated) prompt and completion tokens of the loop.
+    """
+
+    stop_sequence: str = "<OK>"
+    similarity_threshold: float | None = None
+    min_critique_length: int | None = None
+    max_seconds: float | None = None
+    max_tokens: int | None = None
+
+    def _budget_exhausted(self, elapsed: float, tokens: int) -> str | None:
+        if self.max_seconds is not None and elapsed >= self.max_seconds:
+            return f"Time budget of {self.max_seconds}s exhausted"
+        if self.max_tokens is not None and tokens >= self.max_tokens:
+            return f"Token budget of {self.max_tokens} tokens exhausted"
+        return None
+
+    def after_generation(
+        self, previous: str | None, generation: str, elapsed: float, tokens: int
+    ) -> str | None:
+        """
+        Checks whether the loop should stop right after a generation, which saves the reflection call.
+
+        Args:
+            previous (str | None): The previous generation, or None on the first step.
+            generation (str): The new generation.
+            elapsed (float): The seconds elapsed since the loop started.
+            tokens (int): The tokens used since the loop started.
+
+        Returns:
+            str | None: The reason to stop, or None to keep going.
+        """
+        if previous is not None and self.similarity_threshold is not None:
+            similarity = generation_similarity(previous, generation)
+            if similarity >= self.similarity_threshold:
+                return f"Consecutive generations are {similarity:.0%} similar"
+        return self._budget_exhausted(elapsed, tokens)
+
+    def after_reflection(
+        self, critique: str, elapsed: float, tokens: int
+    ) -> str | None:
+        """
+        Checks whether the loop should stop after a critique.
+
+        Args:
+            critique (str): The critique of the last generation.
+            elapsed (float): The seconds elapsed since the loop started.
+            tokens (int): The tokens used since the loop started.
+
+        Returns:
+            str | None: The reason to stop, or None to keep going.
+        """
+        if self.stop_sequence in critique:
+            return "Stop Sequence found"
+        if (
+            self.min_critique_length is not None
+            and len(critique.strip()) < self.min_critique_length
+        ):
+            return f"Critique shorter than {self.min_critique_length} characters"
+        return self._budget_exhausted(elapsed, tokens)
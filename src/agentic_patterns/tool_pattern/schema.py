@@ -0,0 +1,390 @@
+import dataclasses
+import inspect
+import json
+import types
+from enum import Enum
+from typing import Any
+from typing import Callable
+from typing import get_args
+from typing import get_origin
+from typing import get_type_hints
+from typing import Literal
+from typing import Union
+
+JSON_SCHEMA_TYPES = {
+    int: "integer",
+    float: "number",
+    str: "string",
+    bool: "boolean",
+    type(None): "null",
+    dict: "object",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    frozenset: "array",
+}
+
+TRUE_STRINGS = frozenset({"true", "1", "yes", "y"})
+FALSE_STRINGS = frozenset({"false", "0", "no", "n"})
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Converts a default value into a JSON compatible one, returning `inspect.Parameter.empty`
+    if it can't be represented.
+    """
+    if isinstance(value, Enum):
+        value = value.value
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return inspect.Parameter.empty
+    return value
+
+
+def _is_union(origin: Any) -> bool:
+    return origin is Union or origin is types.UnionType
+
+
+def type_to_schema(tp: Any) -> dict:
+    """
+    Converts a Python type annotation into a JSON Schema.
+
+    Supports the JSON scalar types, `list`/`set`/`tuple`/`dict` generics, `Optional` and unions,
+    `Literal`, `Enum` subclasses and (nested) dataclasses.
+
+    Args:
+        tp (Any): The type annotation.
+
+    Returns:
+        dict: The JSON Schema describing the type.
+    """
+    if tp is Any or tp is inspect.Parameter.empty:
+        return {}
+
+    origin, args = get_origin(tp), get_args(tp)
+
+    if _is_union(origin):
+        return {"anyOf": [type_to_schema(arg) for arg in args]}
+
+    if origin is Literal:
+        schema: dict = {"enum": list(args)}
+        value_types = {type(arg) for arg in args}
+        if len(value_types) == 1 and value_types.issubset(JSON_SCHEMA_TYPES):
+            schema["type"] = JSON_SCHEMA_TYPES[value_types.pop()]
+        return schema
+
+    if origin in (list, set, frozenset):
+        return {"type": "array", "items": type_to_schema(args[0]) if args else {}}
+
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return {"type": "array", "items": type_to_schema(args[0])}
+        return {
+            "type": "array",
+            "prefixItems": [type_to_schema(arg) for arg in args],
+            "minItems": len(args),
+            "maxItems": len(args),
+        }
+
+    if origin is dict:
+        schema = {"type": "object"}
+        if args:
+            schema["additionalProperties"] = type_to_schema(args[1])
+        return schema
+
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return type_to_schema(Literal[tuple(member.value for member in tp)])  # type: ignore
+
+    if dataclasses.is_dataclass(tp):
+        hints = get_type_hints(tp)
+        properties = {}
+        required = []
+        for field in dataclasses.fields(tp):
+            properties[field.name] = type_to_schema(hints.get(field.name, Any))
+            if field.default is not dataclasses.MISSING:
+                default = _json_default(field.default)
+                if default is not inspect.Parameter.empty:
+                    properties[field.name]["default"] = default
+            elif field.default_factory is dataclasses.MISSING:
+                required.append(field.name)
+        return {"type": "object", "properties": properties, "required": required}
+
+    if tp in JSON_SCHEMA_TYPES:
+        return {"type": JSON_SCHEMA_TYPES[tp]}
+
+    return {"title": getattr(tp, "__name__", str(tp))}
+
+
+def _load_json_container(value: Any, expected: tuple) -> Any:
+    """
+    Models sometimes send lists or objects as JSON strings: decode them before coercing.
+    """
+    if isinstance(value, str):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            raise TypeError(f"Expected {expected[0].__name__}, got {value!r}")
+        value = decoded
+    if not isinstance(value, expected):
+        raise TypeError(f"Expected {expected[0].__name__}, got {type(value).__name__}")
+    return value
+
+
+def _scalar_coercer(tp: type) -> Callable[[Any], Any]:
+    def coerce(value: Any) -> Any:
+        if type(value) is tp:
+            return value
+        if tp is bool:
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered in TRUE_STRINGS:
+                    return True
+                if lowered in FALSE_STRINGS:
+                    return False
+                raise ValueError(f"Expected boolean, got {value!r}")
+            if isinstance(value, (int, float)):
+                return bool(value)
+            raise TypeError(f"Expected boolean, got {type(value).__name__}")
+        if tp is type(None):
+            if value is None:
+                return None
+            raise TypeError(f"Expected null, got {type(value).__name__}")
+        if tp in (int, float) and isinstance(value, (bool, list, dict, type(None))):
+            raise TypeError(f"Expected {tp.__name__}, got {type(value).__name__}")
+        if tp is int and isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                pass
+            # e.g. "3.0": accepted like the float 3.0, but "3.7" is rejected like 3.7
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError(f"Expected integer, got {value!r}") from None
+        if tp is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"Expected integer, got {value!r}")
+        return tp(value)
+
+    return coerce
+
+
+def build_coercer(tp: Any) -> Callable[[Any], Any]:
+    """
+    Compiles a function that validates a value against a type annotation and converts it to that
+    type when possible (e.g. "3" -> 3 for `int`, a dict -> the dataclass instance for a dataclass).
+
+    Args:
+        tp (Any): The type annotation.
+
+    Returns:
+        Callable[[Any], Any]: A function returning the coerced value. It raises `TypeError` or
+                              `ValueError` when the value doesn't match the type.
+    """
+    if tp is Any or tp is inspect.Parameter.empty:
+        return lambda value: value
+
+    origin, args = get_origin(tp), get_args(tp)
+
+    if _is_union(origin):
+        members = [(get_origin(arg) or arg, build_coercer(arg)) for arg in args]
+
+        def coerce_union(value: Any) -> Any:
+            # Prefer the member whose type already matches, then try converting in order
+            for member_type, coerce in members:
+                if isinstance(member_type, type) and type(value) is member_type:
+                    return coerce(value)
+            for _, coerce in members:
+                try:
+                    return coerce(value)
+                except (TypeError, ValueError):
+                    continue
+            raise TypeError(f"{value!r} doesn't match any of {tp}")
+
+        return coerce_union
+
+    if origin is Literal:
+        allowed = {str(arg): arg for arg in args}
+
+        def coerce_literal(value: Any) -> Any:
+            if value in args:
+                return value
+            if str(value) in allowed:
+                return allowed[str(value)]
+            raise ValueError(f"Expected one of {list(args)}, got {value!r}")
+
+        return coerce_literal
+
+    if origin in (list, set, frozenset) or tp in (list, set, frozenset):
+        container = origin or tp
+        coerce_item = build_coercer(args[0]) if args else build_coercer(Any)
+
+        def coerce_sequence(value: Any) -> Any:
+            value = _load_json_container(value, (list, tuple, set, frozenset))
+            return container(coerce_item(item) for item in value)
+
+        return coerce_sequence
+
+    if origin is tuple or tp is tuple:
+        if not args or (len(args) == 2 and args[1] is Ellipsis):
+            coerce_item = build_coercer(args[0]) if args else build_coercer(Any)
+
+            def coerce_tuple(value: Any) -> Any:
+                value = _load_json_container(value, (list, tuple))
+                return tuple(coerce_item(item) for item in value)
+
+            return coerce_tuple
+
+        coerce_items = [build_coercer(arg) for arg in args]
+
+        def coerce_fixed_tuple(value: Any) -> Any:
+            value = _load_json_container(value, (list, tuple))
+            if len(value) != len(coerce_items):
+                raise ValueError(
+                    f"Expected {len(coerce_items)} items, got {len(value)}"
+                )
+            return tuple(coerce(item) for coerce, item in zip(coerce_items, value))
+
+        return coerce_fixed_tuple
+
+    if origin is dict or tp is dict:
+        coerce_key = build_coercer(args[0]) if args else build_coercer(Any)
+        coerce_value = build_coercer(args[1]) if args else build_coercer(Any)
+
+        def coerce_dict(value: Any) -> Any:
+            value = _load_json_container(value, (dict,))
+            return {coerce_key(k): coerce_value(v) for k, v in value.items()}
+
+        return coerce_dict
+
+    if isinstance(tp, type) and issubclass(tp, Enum):
+
+        def coerce_enum(value: Any) -> Any:
+            if isinstance(value, tp):
+                return value
+            try:
+                return tp(value)
+            except ValueError:
+                if isinstance(value, str) and value in tp.__members__:
+                    return tp[value]
+                raise
+
+        return coerce_enum
+
+    if dataclasses.is_dataclass(tp):
+        hints = get_type_hints(tp)
+        field_coercers = {
+            field.name: build_coercer(hints.get(field.name, Any))
+            for field in dataclasses.fields(tp)
+            if field.init
+        }
+
+        def coerce_dataclass(value: Any) -> Any:
+            if isinstance(value, tp):
+                return value
+            value = _load_json_container(value, (dict,))
+            unexpected = value.keys() - field_coercers.keys()
+            if unexpected:
+                raise ValueError(f"Unexpected fields for {tp.__name__}: {unexpected}")
+            return tp(**{k: field_coercers[k](v) for k, v in value.items()})
+
+        return coerce_dataclass
+
+    if tp in JSON_SCHEMA_TYPES:
+        return _scalar_coercer(tp)
+
+    return lambda value: value if isinstance(value, tp) else tp(value)
+
+
+class ArgumentValidator:
+    """
+    A validator compiled once from a function's signature, which checks and converts the arguments
+    of a call in a single pass.
+
+    Attributes:
+        parameters (dict[str, Callable]): A dictionary mapping each parameter to its compiled coercer.
+        required (frozenset[str]): The names of the parameters without a default value.
+        accepts_extra (bool): Whether the function accepts arbitrary keyword arguments (`**kwargs`).
+    """
+
+    def __init__(self, fn: Callable):
+        signature = inspect.signature(fn)
+        hints = get_type_hints(fn)
+
+        self.parameters: dict[str, Callable[[Any], Any]] = {}
+        required = set()
+        self.accepts_extra = False
+        for name, parameter in signature.parameters.items():
+            if parameter.kind is inspect.Parameter.VAR_KEYWORD:
+                self.accepts_extra = True
+                continue
+            if parameter.kind is inspect.Parameter.VAR_POSITIONAL:
+                continue
+            self.parameters[name] = build_coercer(hints.get(name, Any))
+            if parameter.default is inspect.Parameter.empty:
+                required.add(name)
+        self.required = frozenset(required)
+
+    def __call__(self, arguments: dict) -> dict:
+        """
+        Validates and converts the arguments of a call.
+
+        Args:
+            arguments (dict): The arguments sent by the model.
+
+        Returns:
+            dict: The converted arguments.
+
+        Raises:
+            ValueError: If a required argument is missing, an unexpected one is given, or a value is invalid.
+            TypeError: If a value has the wrong type and can't be converted.
+        """
+        missing = self.required - arguments.keys()
+        if missing:
+            raise ValueError(f"Missing required arguments: {sorted(missing)}")
+
+        validated = {}
+        for name, value in arguments.items():
+            coerce = self.parameters.get(name)
+            if coerce is None:
+                if not self.accepts_extra:
+                    raise ValueError(f"Unexpected argument: {name}")
+                validated[name] = value
+                continue
+            try:
+                validated[name] = coerce(value)
+            except (TypeError, ValueError) as e:
+                raise type(e)(f"Invalid value for argument '{name}': {e}") from e
+        return validated
+
+
+def parameters_schema(fn: Callable) -> dict:
+    """
+    Builds the JSON Schema of the parameters of a function, including their defaults.
+
+    Args:
+        fn (Callable): The function whose parameters must be described.
+
+    Returns:
+        dict: A JSON Schema object with the `properties` and `required` parameters.
+    """
+    signature = inspect.signature(fn)
+    hints = get_type_hints(fn)
+
+    properties = {}
+    required = []
+    for name, parameter in signature.parameters.items():
+        if parameter.kind in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD,
+        ):
+            continue
+        properties[name] = type_to_schema(hints.get(name, Any))
+        if parameter.default is inspect.Parameter.empty:
+            required.append(name)
+        else:
+            default = _json_default(parameter.default)
+            if default is not inspect.Parameter.empty:
+                properties[name]["default"] = default
+
+    return {"type": "object", "properties": properties, "required": required}
@@ -1,34 +1,60 @@
+import copy
+import dataclasses
+import hashlib
+import importlib
+import inspect
 import json
+import threading
+from enum import Enum
+from typing import Any
 from typing import Callable
 
+from agentic_patterns.tool_pattern.schema import ArgumentValidator
+from agentic_patterns.tool_pattern.schema import parameters_schema
+from agentic_patterns.utils.cache import CacheStats
+from agentic_patterns.utils.cache import LRUCache
+from agentic_patterns.utils.cache import MISSING
+from agentic_patterns.utils.tracing import span
+
+# Kept for `validate_arguments`, which still supports signatures created by older versions
+# (Python type names) besides the JSON Schema ones.
+TYPE_MAPPING = {
+    "int": int,
+    "integer": int,
+    "str": str,
+    "string": str,
+    "bool": bool,
+    "boolean": bool,
+    "float": float,
+    "number": float,
+}
+
 
 def get_fn_signature(fn: Callable) -> dict:
     """
-    Generates the signature for a given function.
+    Generates the signature for a given function, describing its parameters with JSON Schema.
 
     Args:
         fn (Callable): The function whose signature needs to be extracted.
 
     Returns:
         dict: A dictionary containing the function's name, description,
-              and parameter types.
+              and parameters schema (types, defaults and required parameters).
     """
-    fn_signature: dict = {
+    return {
         "name": fn.__name__,
         "description": fn.__doc__,
-        "parameters": {"properties": {}},
-    }
-    schema = {
-        k: {"type": v.__name__} for k, v in fn.__annotations__.items() if k != "return"
+        "parameters": parameters_schema(fn),
     }
-    fn_signature["parameters"]["properties"] = schema
-    return fn_signature
 
 
 def validate_arguments(tool_call: dict, tool_signature: dict) -> dict:
     """
     Validates and converts arguments in the input dictionary to match the expected types.
 
+    Only scalar types are supported. Tools created with the `tool` decorator use `Tool.validate`
+    instead, which is compiled from the function's type hints and supports any annotation.
+
     Args:
         tool_call (dict): A dictionary containing the arguments passed to the tool.
         tool_signature (dict): The expected function signature and parameter types.
@@ -38,23 +64,81 @@ def validate_arguments(tool_call: dict, tool_signature: dict) -> dict:
     """
     properties = tool_signature["parameters"]["properties"]
 
-    # TODO: This is overly simplified but enough for simple Tools.
-    type_mapping = {
-        "int": int,
-        "str": str,
-        "bool": bool,
-        "float": float,
-    }
-
     for arg_name, arg_value in tool_call["arguments"].items():
-        expected_type = properties[arg_name].get("type")
+        expected_type = TYPE_MAPPING.get(properties[arg_name].get("type"))
 
-        if not isinstance(arg_value, type_mapping[expected_type]):
-            tool_call["arguments"][arg_name] = type_mapping[expected_type](arg_value)
+        if expected_type is not None and not isinstance(arg_value, expected_type):
+            tool_call["arguments"][arg_name] = expected_type(arg_value)
 
     return tool_call
 
 
+def _canonical_value(value: Any) -> Any:
+    """
+    Converts validated arguments (which may contain dataclasses, enums or sets) into plain JSON values.
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonical_value(dataclasses.asdict(value))
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(k): _canonical_value(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical_value(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(v) for v in value]
+    return value
+
+
+def arguments_key(tool_name: str, arguments: dict) -> str:
+    """
+    Builds a canonical key for a tool call, so calls with the same arguments share a cache entry
+    regardless of the order or formatting of the arguments.
+
+    Args:
+        tool_name (str): The name of the tool.
+        arguments (dict): The validated arguments of the call.
+
+    Returns:
+        str: The cache key of the call.
+    """
+    payload = json.dumps(
+        _canonical_value(arguments), sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return f"{tool_name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+# Results that the cache can share without copying them
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _is_json_value(value: Any) -> bool:
+    """
+    Checks whether a value survives a JSON round trip unchanged (e.g. tuples become lists).
+    """
+    if type(value) in (str, int, float, bool, type(None)):
+        return True
+    if type(value) is list:
+        return all(_is_json_value(v) for v in value)
+    if type(value) is dict:
+        return all(isinstance(k, str) and _is_json_value(v) for k, v in value.items())
+    return False
+
+
+def _detached(value: Any) -> Any:
+    """
+    Returns a copy of a mutable value, so the cached one can't be changed through it.
+    """
+    return value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value)
+
+
+def _import_object(module: str, qualname: str) -> Any:
+    obj = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        obj = getattr(obj, attribute)
+    return obj
+
+
 class Tool:
     """
     A class representing a tool that wraps a callable and its signature.
@@ -63,19 +147,82 @@ class Tool:
         name (str): The name of the tool (function).
         fn (Callable): The function that the tool represents.
         fn_signature (str): JSON string representation of the function's signature.
+        signature (dict): The parsed function's signature, computed once when the tool is built.
+        validator (ArgumentValidator): The arguments validator, compiled once from the function's type hints.
+        timeout (float | None): Maximum number of seconds a single call may take when tool calls
+                                run concurrently. None means no limit.
+        cache (LRUCache | None): The cache memoizing the results of the tool, if any. It can be shared
+                                 with other tools, since keys include the tool name. An `LRUCache`
+                                 keeps copies of the results, any other cache (e.g. a `SQLiteCache`)
+                                 is assumed to serialise them, and only gets JSON values.
+        cache_stats (CacheStats): The hit/miss counters of this tool's calls to the cache.
     """
 
-    def __init__(self, name: str, fn: Callable, fn_signature: str):
+    def __init__(
+        self,
+        name: str,
+        fn: Callable,
+        fn_signature: str,
+        timeout: float | None = None,
+        cache: LRUCache | None = None,
+    ):
         self.name = name
         self.fn = fn
         self.fn_signature = fn_signature
+        self.signature = json.loads(fn_signature)
+        self.validator = ArgumentValidator(fn)
+        self._parameters = inspect.signature(fn)
+        self.timeout = timeout
+        self.cache = cache
+        self.cache_stats = CacheStats()
+        self._stats_lock = threading.Lock()
 
     def __str__(self):
         return self.fn_signature
 
+    def __reduce__(self):
+        """
+        Pickles the tool by reference, so it can be sent to worker processes: a tool created with the
+        `tool` decorator is re-imported by the module and name of its function (keeping its options
+        and cache), any other one is rebuilt from its function, without its cache.
+
+        Raises:
+            TypeError: If the function isn't importable, e.g. because it's defined inside another one.
+        """
+        module, qualname = self.fn.__module__, self.fn.__qualname__
+        if "<locals>" in qualname:
+            raise TypeError(
+                f"Tool {self.name!r} can't be pickled: its function must be defined at "
+                "the top level of a module"
+            )
+        try:
+            if _import_object(module, qualname) is self:
+                return _import_object, (module, qualname)
+        except (ImportError, AttributeError):
+            pass
+        return Tool, (self.name, self.fn, self.fn_signature, self.timeout)
+
+    def validate(self, arguments: dict) -> dict:
+        """
+        Validates the arguments of a tool call, converting them to the expected types.
+
+        Args:
+            arguments (dict): The arguments sent by the model.
+
+        Returns:
+            dict: The validated and converted arguments.
+
+        Raises:
+            ValueError: If an argument is missing, unexpected or invalid.
+            TypeError: If an argument has the wrong type and can't be converted.
+        """
+        return self.validator(arguments)
+
     def run(self, **kwargs):
         """
-        Executes the tool (function) with provided arguments.
+        Executes the tool (function) with provided arguments. If the tool has a cache, results
+        are memoized by the canonicalised arguments, defaults included. Every call gets its own
+        copy of a cached mutable result.
 
         Args:
             **kwargs: Keyword arguments passed to the function.
@@ -83,24 +230,87 @@ class Tool:
         Returns:
             The result of the function call.
         """
-        return self.fn(**kwargs)
+        with span("tool.call", tool=self.name) as tool_span:
+            if self.cache is None:
+                return self.fn(**kwargs)
 
+            try:
+                arguments = self._parameters.bind(**kwargs)
+            except TypeError:
+                # Let the function raise its own error for the invalid arguments
+                return self.fn(**kwargs)
+            arguments.apply_defaults()
 
-def tool(fn: Callable):
+            key = arguments_key(self.name, arguments.arguments)
+            in_memory = isinstance(self.cache, LRUCache)
+            result = self.cache.get(key)
+            tool_span.set_attribute("cache_hit", result is not MISSING)
+            with self._stats_lock:
+                if result is MISSING:
+                    self.cache_stats.misses += 1
+                else:
+                    self.cache_stats.hits += 1
+                    return _detached(result) if in_memory else result
+
+            result = self.fn(**kwargs)
+            if in_memory:
+                self.cache.set(key, _detached(result))
+            elif _is_json_value(result):
+                self.cache.set(key, result)
+            return result
+
+
+def tool(
+    fn: Callable | None = None,
+    *,
+    timeout: float | None = None,
+    cache: str | LRUCache | None = None,
+    maxsize: int = 128,
+    ttl: float | None = None,
+):
     """
     A decorator that wraps a function into a Tool object.
 
+    It can be used both bare (`@tool`) and with options (e.g. `@tool(timeout=5)` or
+    `@tool(cache="lru", maxsize=256, ttl=600)`). Only pure tools, whose result depends
+    exclusively on their arguments, should be memoized.
+
     Args:
-        fn (Callable): The function to be wrapped.
+        fn (Callable | None): The function to be wrapped.
+        timeout (float | None, optional): Maximum number of seconds a single call to the tool may take
+                                          when tool calls run concurrently. Defaults to None (no limit).
+        cache (str | LRUCache | None, optional): "lru" to memoize the results in a cache of the tool's own,
+                                                 or a cache object (anything with the `get`/`set` interface
+                                                 of `LRUCache`, e.g. a `SQLiteCache`) shared with other tools.
+                                                 Results that aren't JSON values are only cached in an
+                                                 `LRUCache`. Defaults to None.
+        maxsize (int, optional): The maximum number of results kept by the tool's own LRU cache. Defaults to 128.
+        ttl (float | None, optional): The number of seconds a result stays valid in the tool's own LRU cache.
+                                      Defaults to None (no expiration).
 
     Returns:
         Tool: A Tool object containing the function, its name, and its signature.
+
+    Raises:
+        ValueError: If `cache` is an unknown cache type.
     """
+    if cache == "lru":
+        tool_cache = LRUCache(maxsize=maxsize, ttl=ttl)
+    elif isinstance(cache, str):
+        raise ValueError(f"Unknown tool cache type: {cache}")
+    else:
+        tool_cache = cache
 
-    def wrapper():
+    def wrapper(fn: Callable) -> Tool:
         fn_signature = get_fn_signature(fn)
         return Tool(
-            name=fn_signature.get("name"), fn=fn, fn_signature=json.dumps(fn_signature)
+            name=fn_signature.get("name"),
+            fn=fn,
+            fn_signature=json.dumps(fn_signature),
+            timeout=timeout,
+            cache=tool_cache,
         )
 
-    return wrapper()
+    if fn is None:
+        return wrapper
+    return wrapper(fn)
@@ -1,19 +1,22 @@
-import json
+import asyncio
 import re
-
-from colorama import Fore
-from dotenv import load_dotenv
-from groq import Groq
+from typing import TYPE_CHECKING
 
 from agentic_patterns.tool_pattern.tool import Tool
-from agentic_patterns.tool_pattern.tool import validate_arguments
+from agentic_patterns.tool_pattern.tool_executor import execute_tool_calls
+from agentic_patterns.utils.clients import get_async_client
+from agentic_patterns.utils.clients import get_client
+from agentic_patterns.utils.completions import acompletions_create
 from agentic_patterns.utils.completions import build_prompt_structure
 from agentic_patterns.utils.completions import ChatHistory
 from agentic_patterns.utils.completions import completions_create
 from agentic_patterns.utils.completions import update_chat_history
 from agentic_patterns.utils.extraction import extract_tag_content
+from agentic_patterns.utils.tracing import span
 
-load_dotenv()
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+    from groq import Groq
 
 
 TOOL_SYSTEM_PROMPT = """
@@ -45,18 +48,57 @@ class ToolAgent:
         tools (Tool | list[Tool]): A list of tools available to the agent.
         model (str): The model to be used for generating tool calls and responses.
         client (Groq): The Groq client used to interact with the language model.
+        async_client (AsyncGroq): The AsyncGroq client used by `arun`.
         tools_dict (dict): A dictionary mapping tool names to their corresponding Tool objects.
+        max_tool_workers (int): The maximum number of tool calls executed concurrently in one turn.
+        tool_timeout (float | None): Default maximum number of seconds for each tool call.
     """
 
     def __init__(
         self,
         tools: Tool | list[Tool],
         model: str = "llama-3.3-70b-versatile",
+        max_tool_workers: int = 1,
+        tool_timeout: float | None = None,
+        client: "Groq | None" = None,
+        async_client: "AsyncGroq | None" = None,
     ) -> None:
-        self.client = Groq()
+        self._client = client
+        self._async_client = async_client
         self.model = model
         self.tools = tools if isinstance(tools, list) else [tools]
         self.tools_dict = {tool.name: tool for tool in self.tools}
+        self._system_prompt_key: tuple | None = None
+        self._compiled_system_prompt = ""
+        self.compile_system_prompt()
+        self.max_tool_workers = max_tool_workers
+        self.tool_timeout = tool_timeout
+
+    @property
+    def client(self) -> "Groq":
+        """
+        Returns the injected Groq client or, if none was given, the process-wide shared one
+        from `agentic_patterns.utils.clients`.
+        """
+        return self._client if self._client is not None else get_client()
+
+    @client.setter
+    def client(self, client: "Groq | None"):
+        self._client = client
+
+    @property
+    def async_client(self) -> "AsyncGroq":
+        """
+        Returns the injected AsyncGroq client or, if none was given, the shared one
+        bound to the running event loop.
+        """
+        return (
+            self._async_client if self._async_client is not None else get_async_client()
+        )
+
+    @async_client.setter
+    def async_client(self, async_client: "AsyncGroq | None"):
+        self._async_client = async_client
 
     def add_tool_signatures(self) -> str:
         """
@@ -67,73 +109,129 @@ class ToolAgent:
         """
         return "".join([tool.fn_signature for tool in self.tools])
 
+    def compile_system_prompt(self) -> str:
+        """
+        Returns the system prompt of the agent: the tool calling instructions followed by
+        the tool signatures.
+
+        The prompt is built once and reused (byte for byte) across runs, so providers can reuse their
+        prompt prefix caches. It's only rebuilt when the tools change.
+
+        Returns:
+            str: The compiled system prompt.
+        """
+        key = tuple(self.tools)
+        if key != self._system_prompt_key:
+            self.tools_dict = {tool.name: tool for tool in self.tools}
+            self._compiled_system_prompt = (
+                TOOL_SYSTEM_PROMPT % self.add_tool_signatures()
+            )
+            self._system_prompt_key = key
+        return self._compiled_system_prompt
+
     def process_tool_calls(self, tool_calls_content: list) -> dict:
         """
         Processes each tool call, validates arguments, executes the tools, and collects results.
 
+        When `max_tool_workers` is greater than 1, the tool calls run concurrently. A failing or
+        timed out call produces an error observation instead of aborting the whole turn.
+
         Args:
             tool_calls_content (list): List of strings, each representing a tool call in JSON format.
 
         Returns:
             dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
         """
-        observations = {}
-        for tool_call_str in tool_calls_content:
-            tool_call = json.loads(tool_call_str)
-            tool_name = tool_call["name"]
-            tool = self.tools_dict[tool_name]
-
-            print(Fore.GREEN + f"\nUsing Tool: {tool_name}")
-
-            # Validate and execute the tool call
-            validated_tool_call = validate_arguments(
-                tool_call, json.loads(tool.fn_signature)
-            )
-            print(Fore.GREEN + f"\nTool call dict: \n{validated_tool_call}")
-
-            result = tool.run(**validated_tool_call["arguments"])
-            print(Fore.GREEN + f"\nTool result: \n{result}")
-
-            # Store the result using the tool call ID
-            observations[validated_tool_call["id"]] = result
-
-        return observations
+        return execute_tool_calls(
+            self.tools_dict,
+            tool_calls_content,
+            max_workers=self.max_tool_workers,
+            timeout=self.tool_timeout,
+        )
 
-    def run(
-        self,
-        user_msg: str,
-    ) -> str:
+    def _build_chat_histories(self, user_msg: str) -> tuple[ChatHistory, ChatHistory]:
         """
-        Handles the full process of interacting with the language model and executing a tool based on user input.
+        Builds the chat history used to generate the tool calls and the one used for the final answer.
 
         Args:
             user_msg (str): The user's message that prompts the tool agent to act.
 
         Returns:
-            str: The final output after executing the tool and generating a response from the model.
+            tuple[ChatHistory, ChatHistory]: The tool chat history and the agent chat history.
         """
         user_prompt = build_prompt_structure(prompt=user_msg, role="user")
 
         tool_chat_history = ChatHistory(
             [
                 build_prompt_structure(
-                    prompt=TOOL_SYSTEM_PROMPT % self.add_tool_signatures(),
+                    prompt=self.compile_system_prompt(),
                     role="system",
                 ),
                 user_prompt,
             ]
         )
         agent_chat_history = ChatHistory([user_prompt])
+        return tool_chat_history, agent_chat_history
 
-        tool_call_response = completions_create(
-            self.client, messages=tool_chat_history, model=self.model
-        )
-        tool_calls = extract_tag_content(str(tool_call_response), "tool_call")
+    def run(
+        self,
+        user_msg: str,
+    ) -> str:
+        """
+        Handles the full process of interacting with the language model and executing a tool based on user input.
 
-        if tool_calls.found:
-            observations = self.process_tool_calls(tool_calls.content)
-            update_chat_history(
-                agent_chat_history, f'f"Observation: {observations}"', "user"
+        Args:
+            user_msg (str): The user's message that prompts the tool agent to act.
+
+        Returns:
+            str: The final output after executing the tool and generating a response from the model.
+        """
+        tool_chat_history, agent_chat_history = self._build_chat_histories(user_msg)
+
+        with span("tool_agent.run", model=self.model, tools=len(self.tools)):
+            tool_call_response = completions_create(
+                self.client, messages=tool_chat_history, model=self.model
             )
+            tool_calls = extract_tag_content(str(tool_call_response), "tool_call")
+
+            if tool_calls.found:
+                observations = self.process_tool_calls(tool_calls.content)
+                update_chat_history(
+                    agent_chat_history, f'f"Observation: {observations}"', "user"
+                )
 
-        return completions_create(self.client, agent_chat_history, self.model)
+            return completions_create(self.client, agent_chat_history, self.model)
+
+    async def arun(
+        self,
+        user_msg: str,
+    ) -> str:
+        """
+        Asynchronous version of `run`. The LLM calls go through the async client and the tools,
+        which are regular functions, run in a worker thread so they don't block the event loop.
+
+        Args:
+            user_msg (str): The user's message that prompts the tool agent to act.
+
+        Returns:
+            str: The final output after executing the tool and generating a response from the model.
+        """
+        tool_chat_history, agent_chat_history = self._build_chat_histories(user_msg)
+
+        with span("tool_agent.run", model=self.model, tools=len(self.tools)):
+            tool_call_response = await acompletions_create(
+                self.async_client, messages=tool_chat_history, model=self.model
+            )
+            tool_calls = extract_tag_content(str(tool_call_response), "tool_call")
+
+            if tool_calls.found:
+                observations = await asyncio.to_thread(
+                    self.process_tool_calls, tool_calls.content
+                )
+                update_chat_history(
+                    agent_chat_history, f'f"Observation: {observations}"', "user"
+                )
+
+            return await acompletions_create(
+                self.async_client, agent_chat_history, self.model
+            )
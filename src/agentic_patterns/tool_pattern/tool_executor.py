@@ -0,0 +1,246 @@
+import contextvars
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from agentic_patterns.tool_pattern.tool import Tool
+
+logger = logging.getLogger(__name__)
+
+
+def error_observation(error: Exception) -> dict:
+    """
+    Builds the observation returned to the model when a tool call fails.
+
+    Args:
+        error (Exception): The exception raised while parsing, validating or running the tool call.
+
+    Returns:
+        dict: A dictionary with a single `error` key describing what went wrong.
+    """
+    return {"error": f"{type(error).__name__}: {error}"}
+
+
+def prepare_tool_call(
+    tool_call_str: str, tools_dict: dict[str, Tool]
+) -> tuple[dict, Tool]:
+    """
+    Parses a tool call and validates its arguments against the signature of the requested tool.
+
+    Args:
+        tool_call_str (str): A string representing a tool call in JSON format.
+        tools_dict (dict[str, Tool]): A dictionary mapping tool names to their corresponding Tool objects.
+
+    Returns:
+        tuple[dict, Tool]: The validated tool call dictionary and the tool that must run it.
+
+    Raises:
+        ValueError: If the requested tool is not available.
+    """
+    tool_call = json.loads(tool_call_str)
+    tool_name = tool_call["name"]
+    if tool_name not in tools_dict:
+        raise ValueError(f"Unknown tool: {tool_name}")
+    tool = tools_dict[tool_name]
+
+    logger.info("Using Tool: %s", tool_name, extra={"kind": "tool"})
+
+    # Validate (and convert) the arguments with the validator compiled for the tool
+    tool_call["arguments"] = tool.validate(tool_call.get("arguments") or {})
+    logger.debug("Tool call dict: \n%s", tool_call, extra={"kind": "tool"})
+
+    return tool_call, tool
+
+
+def tool_call_id(tool_call: dict, default: str, taken) -> str | int:
+    """
+    Reads the ID of a tool call, which keys its observation.
+
+    Args:
+        tool_call (dict): The parsed tool call.
+        default (str): The ID used when the call has none.
+        taken (Container): The IDs of the previous calls of the turn.
+
+    Returns:
+        str | int: The ID of the tool call.
+
+    Raises:
+        ValueError: If the ID isn't a string or an integer, or is already used by another call.
+    """
+    call_id = tool_call.get("id", default)
+    if not isinstance(call_id, (str, int)) or isinstance(call_id, bool):
+        raise ValueError(f"Invalid tool call id: {call_id!r}")
+    if call_id in taken:
+        raise ValueError(f"Duplicate tool call id: {call_id!r}")
+    return call_id
+
+
+def run_tool(tool: Tool, arguments: dict):
+    """
+    Runs a tool with the given (already validated) arguments.
+
+    Args:
+        tool (Tool): The tool to run.
+        arguments (dict): The keyword arguments passed to the tool.
+
+    Returns:
+        The result of the tool call.
+    """
+    result = tool.run(**arguments)
+    logger.debug("Tool result: \n%s", result, extra={"kind": "tool"})
+    return result
+
+
+def prepare_tool_calls(
+    tools_dict: dict[str, Tool],
+    tool_calls_content: list,
+    observations: dict,
+    timeout: float | None = None,
+    first_position: int = 0,
+) -> list[tuple]:
+    """
+    Parses and validates tool calls of a model turn, without running them.
+
+    Each call gets a slot in `observations`, in the order of the calls: an error observation if
+    it can't be parsed or validated (or its ID is invalid or already used in the turn), None
+    otherwise, until its result is known.
+
+    Args:
+        tools_dict (dict[str, Tool]): A dictionary mapping tool names to their corresponding Tool objects.
+        tool_calls_content (list): List of strings, each representing a tool call in JSON format.
+        observations (dict): The observations of the turn so far, keyed by tool call ID. It's updated
+                             in place.
+        timeout (float | None, optional): Default maximum number of seconds for each tool call. A tool's own
+                                          `timeout` takes precedence. Defaults to None (no limit).
+        first_position (int, optional): The position of the first tool call in the model turn, used to
+                                        identify calls whose ID can't be parsed. Defaults to 0.
+
+    Returns:
+        list[tuple]: The `(call_id, tool, arguments, timeout)` of each valid call, to be run with
+                     `run_tool_calls`.
+    """
+    calls = []
+    for position, tool_call_str in enumerate(tool_calls_content, first_position):
+        call_id = f"tool_call_{position}"
+        try:
+            tool_call, tool = prepare_tool_call(tool_call_str, tools_dict)
+            call_id = tool_call_id(tool_call, call_id, observations)
+        except Exception as e:
+            observations[call_id] = error_observation(e)
+            continue
+
+        observations[call_id] = None  # Reserve the slot to keep the call order
+        call_timeout = tool.timeout if tool.timeout is not None else timeout
+        calls.append((call_id, tool, tool_call["arguments"], call_timeout))
+    return calls
+
+
+def run_tool_calls(calls: list[tuple], max_workers: int = 1) -> dict:
+    """
+    Runs tool calls prepared with `prepare_tool_calls`, optionally concurrently.
+
+    Any error raised while running a tool call (including a timeout) is stored as an error
+    observation for that call, so the remaining calls are not affected.
+
+    Args:
+        calls (list[tuple]): The `(call_id, tool, arguments, timeout)` of each call.
+        max_workers (int, optional): The maximum number of tool calls running at the same time. Defaults to 1.
+
+    Returns:
+        dict: A dictionary where the keys are tool call IDs and values are the results from the tools.
+    """
+    observations = {}
+    if max_workers <= 1 and all(call[3] is None for call in calls):
+        for call_id, tool, arguments, _ in calls:
+            try:
+                observations[call_id] = run_tool(tool, arguments)
+            except Exception as e:
+                observations[call_id] = error_observation(e)
+        return observations
+
+    # At most `max_workers` calls run at the same time, but the pool can grow up to one thread
+    # per call: a timed-out call keeps its thread busy, and the next calls must not queue behind
+    # it. Calls are submitted only when they can start, so a call's deadline starts counting
+    # (approximately) when the call starts running.
+    max_workers = max(max_workers, 1)
+    executor = ThreadPoolExecutor(max_workers=max(len(calls), 1))
+    pending = list(reversed(calls))
+    running: dict = {}
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                call_id, tool, arguments, call_timeout = pending.pop()
+                deadline = (
+                    time.monotonic() + call_timeout
+                    if call_timeout is not None
+                    else None
+                )
+                # Copy the context so the tool's span is a child of the current one
+                future = executor.submit(
+                    contextvars.copy_context().run, run_tool, tool, arguments
+                )
+                running[future] = (call_id, call_timeout, deadline)
+
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            wait_timeout = (
+                max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            )
+            done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                call_id, _, _ = running.pop(future)
+                try:
+                    observations[call_id] = future.result()
+                except Exception as e:
+                    observations[call_id] = error_observation(e)
+
+            now = time.monotonic()
+            for future, (call_id, call_timeout, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    # Threads can't be killed: the call is abandoned and keeps running
+                    # in the background, but the turn doesn't wait for it anymore.
+                    running.pop(future)
+                    observations[call_id] = error_observation(
+                        TimeoutError(f"Tool call exceeded {call_timeout} seconds")
+                    )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return observations
+
+
+def execute_tool_calls(
+    tools_dict: dict[str, Tool],
+    tool_calls_content: list,
+    max_workers: int = 1,
+    timeout: float | None = None,
+    first_position: int = 0,
+) -> dict:
+    """
+    Validates and executes the tool calls of a model turn, optionally running them concurrently.
+
+    Any error raised while parsing, validating or running a tool call (including a timeout) is
+    stored as an error observation for that call, so the remaining calls are not affected.
+
+    Args:
+        tools_dict (dict[str, Tool]): A dictionary mapping tool names to their corresponding Tool objects.
+        tool_calls_content (list): List of strings, each representing a tool call in JSON format.
+        max_workers (int, optional): The maximum number of tool calls running at the same time. Defaults to 1.
+        timeout (float | None, optional): Default maximum number of seconds for each tool call. A tool's own
+                                          `timeout` takes precedence. Defaults to None (no limit).
+        first_position (int, optional): The position of the first tool call in the model turn, used to
+                                        identify calls whose ID can't be parsed. Defaults to 0.
+
+    Returns:
+        dict: A dictionary where the keys are tool call IDs and values are the results from the tools,
+              in the same order as the tool calls.
+    """
+    observations = {}
+    calls = prepare_tool_calls(
+        tools_dict, tool_calls_content, observations, timeout, first_position
+    )
+    observations.update(run_tool_calls(calls, max_workers))
+    return observations
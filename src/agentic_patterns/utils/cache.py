@@ -0,0 +1,310 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+MISSING = object()
+
+
+def canonical_key(model: str, messages: list) -> str:
+    """
+    Builds a canonical hash for a `(model, messages)` request, so that requests that only differ in
+    dict key order or JSON formatting share the same cache entry.
+
+    Args:
+        model (str): The model name.
+        messages (list[dict]): The list of messages sent to the model.
+
+    Returns:
+        str: The SHA-256 hex digest identifying the request.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": list(messages)},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """
+    A data class with the hit/miss counters of a cache.
+
+    Attributes:
+        hits (int): The number of lookups that found a value.
+        misses (int): The number of lookups that didn't find a value.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found a value."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded in-memory cache with least-recently-used eviction and an optional TTL.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept in memory.
+        ttl (float | None): The number of seconds an entry stays valid. None means it never expires.
+        stats (CacheStats): The hit/miss counters of the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """
+        Looks up a key, returning `MISSING` if it's not cached or has expired.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            Any: The cached value or `MISSING`.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._data[key]
+            self.stats.misses += 1
+            return MISSING
+
+    def set(self, key: str, value: Any):
+        """
+        Stores a value, evicting the least recently used entries if the cache is full.
+
+        Args:
+            key (str): The key of the entry.
+            value (Any): The value to store.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache:
+    """
+    A persistent cache stored in a SQLite database, with an optional TTL and a maximum number of entries.
+    When the cache grows beyond `max_entries`, the least recently used entries are evicted.
+
+    Values must be JSON serialisable.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        ttl (float | None): The number of seconds an entry stays valid. None means it never expires.
+        max_entries (int | None): The maximum number of entries kept on disk. None means no limit.
+        stats (CacheStats): The hit/miss counters of the cache.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        """
+        Looks up a key, returning `MISSING` if it's not cached or has expired.
+
+        Args:
+            key (str): The key to look up.
+
+        Returns:
+            Any: The cached value or `MISSING`.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (self.ttl is None or row[1] + self.ttl > now):
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self.stats.hits += 1
+                return json.loads(row[0])
+            if row is not None:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.stats.misses += 1
+            return MISSING
+
+    def set(self, key: str, value: Any):
+        """
+        Stores a value, evicting expired and least recently used entries when needed.
+
+        Args:
+            key (str): The key of the entry.
+            value (Any): The value to store. It must be JSON serialisable.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            if self.ttl is not None:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE created_at <= ?", (now - self.ttl,)
+                )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CompletionCache:
+    """
+    A two-tier cache for LLM completions: a bounded in-memory LRU in front of an optional
+    persistent store. Values found on disk are promoted to the memory tier.
+
+    Attributes:
+        memory (LRUCache): The in-memory tier.
+        disk (SQLiteCache | None): The optional persistent tier.
+        stats (CacheStats): The overall hit/miss counters of the cache.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache | None = None,
+        disk: SQLiteCache | None = None,
+    ):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, model: str, messages: list) -> str | None:
+        """
+        Looks up the completion of a `(model, messages)` request.
+
+        Args:
+            model (str): The model name.
+            messages (list[dict]): The list of messages sent to the model.
+
+        Returns:
+            str | None: The cached completion, or None on a cache miss.
+        """
+        key = canonical_key(model, messages)
+        value = self.memory.get(key)
+        if value is MISSING and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not MISSING:
+                self.memory.set(key, value)
+
+        with self._lock:
+            if value is MISSING:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            return value
+
+    def set(self, model: str, messages: list, completion: str):
+        """
+        Stores the completion of a `(model, messages)` request in every tier.
+
+        Args:
+            model (str): The model name.
+            messages (list[dict]): The list of messages sent to the model.
+            completion (str): The completion returned by the model.
+        """
+        key = canonical_key(model, messages)
+        self.memory.set(key, completion)
+        if self.disk is not None:
+            self.disk.set(key, completion)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+_completion_cache: CompletionCache | None = None
+
+
+def set_completion_cache(cache: CompletionCache | None):
+    """
+    Sets the cache used by default by `completions_create` (and therefore by every agent).
+    Passing None disables caching.
+
+    Args:
+        cache (CompletionCache | None): The cache to use by default.
+    """
+    global _completion_cache
+    _completion_cache = cache
+
+
+def get_completion_cache() -> CompletionCache | None:
+    """
+    Returns the cache used by default by `completions_create`.
+
+    Returns:
+        CompletionCache | None: The default completion cache, if any.
+    """
+    return _completion_cache
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+from agentic_patterns.utils.config import load_config
+
+if TYPE_CHECKING:
+    import httpx
+    from groq import AsyncGroq
+    from groq import Groq
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+class ClientRegistry:
+    """
+    A process-wide registry of Groq clients, so every agent shares the same keep-alive connection pool
+    instead of opening its own. Any client class with the same constructor (e.g. `openai.OpenAI`, for
+    OpenAI-compatible endpoints) can be pooled the same way.
+
+    Nothing is imported nor created until the first client is requested, which is also when the `.env`
+    file is loaded (see `load_config`).
+
+    The sync client is shared by all threads (httpx clients are thread-safe). Async clients are bound to
+    the event loop they are used from, so the registry keeps one per running event loop.
+
+    Attributes:
+        max_connections (int): The maximum number of concurrent connections of each pool.
+        max_keepalive_connections (int): The maximum number of idle connections kept alive in each pool.
+        client_cls (type | None): The class of the sync client. Defaults to `Groq`.
+        async_client_cls (type | None): The class of the async clients. Defaults to `AsyncGroq`.
+        client_kwargs (dict): Extra keyword arguments passed to the clients (e.g. `api_key`, `timeout`).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        client_cls: type | None = None,
+        async_client_cls: type | None = None,
+        **client_kwargs,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.client_cls = client_cls
+        self.async_client_cls = async_client_cls
+        self.client_kwargs = client_kwargs
+
+        self._lock = threading.Lock()
+        self._client: "Groq | None" = None
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _limits(self) -> "httpx.Limits":
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+
+    def _client_classes(self) -> tuple[type, type]:
+        if self.client_cls is None or self.async_client_cls is None:
+            from groq import AsyncGroq
+            from groq import Groq
+
+            self.client_cls = self.client_cls or Groq
+            self.async_client_cls = self.async_client_cls or AsyncGroq
+        return self.client_cls, self.async_client_cls
+
+    def get_client(self) -> "Groq":
+        """
+        Returns the shared sync client, creating it on first use.
+
+        Returns:
+            Groq: The shared client.
+        """
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+
+                    load_config()
+                    client_cls, _ = self._client_classes()
+                    self._client = client_cls(
+                        http_client=httpx.Client(limits=self._limits()),
+                        **self.client_kwargs,
+                    )
+        return self._client
+
+    def get_async_client(self) -> "AsyncGroq":
+        """
+        Returns the async client bound to the running event loop, creating it on first use.
+
+        Returns:
+            AsyncGroq: The async client shared by all the tasks of the running event loop.
+
+        Raises:
+            RuntimeError: If called outside of a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            with self._lock:
+                client = self._async_clients.get(loop)
+                if client is None:
+                    import httpx
+
+                    load_config()
+                    _, async_client_cls = self._client_classes()
+                    client = async_client_cls(
+                        http_client=httpx.AsyncClient(limits=self._limits()),
+                        **self.client_kwargs,
+                    )
+                    self._async_clients[loop] = client
+        return client
+
+    def close(self):
+        """
+        Closes the shared sync client. Async clients are released together with their event loop.
+        """
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            self._async_clients.clear()
+
+
+_registry = ClientRegistry()
+
+
+def configure_clients(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    **client_kwargs,
+) -> ClientRegistry:
+    """
+    Replaces the process-wide client registry. Agents without an injected client pick up the new
+    clients on their next request; the previous clients are left untouched for in-flight requests.
+
+    Args:
+        max_connections (int, optional): The maximum number of concurrent connections of each pool.
+        max_keepalive_connections (int, optional): The maximum number of idle connections kept alive in each pool.
+        **client_kwargs: Extra keyword arguments passed to the Groq clients (e.g. `api_key`, `timeout`).
+
+    Returns:
+        ClientRegistry: The new registry.
+    """
+    global _registry
+    _registry = ClientRegistry(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        **client_kwargs,
+    )
+    return _registry
+
+
+def get_client() -> "Groq":
+    """
+    Returns the process-wide shared Groq client.
+
+    Returns:
+        Groq: The shared Groq client.
+    """
+    return _registry.get_client()
+
+
+def get_async_client() -> "AsyncGroq":
+    """
+    Returns the process-wide shared AsyncGroq client for the running event loop.
+
+    Returns:
+        AsyncGroq: The shared AsyncGroq client.
+    """
+    return _registry.get_async_client()
@@ -1,17 +1,271 @@
-def completions_create(client, messages: list, model: str) -> str:
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from collections.abc import Sequence
+from itertools import chain
+
+from agentic_patterns.utils.cache import canonical_key
+from agentic_patterns.utils.cache import CompletionCache
+from agentic_patterns.utils.cache import get_completion_cache
+from agentic_patterns.utils.rate_limit import estimate_request_tokens
+from agentic_patterns.utils.rate_limit import get_rate_limiter
+from agentic_patterns.utils.rate_limit import provider_of
+from agentic_patterns.utils.singleflight import get_request_coalescer
+from agentic_patterns.utils.tokens import add_usage
+from agentic_patterns.utils.tokens import estimate_message_tokens
+from agentic_patterns.utils.tokens import estimate_tokens
+from agentic_patterns.utils.tracing import end_span
+from agentic_patterns.utils.tracing import record_usage
+from agentic_patterns.utils.tracing import span
+from agentic_patterns.utils.tracing import start_span
+
+
+def _total_tokens(response) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def _coalescing_key(client, model: str, messages: list) -> str:
+    # Only the requests sent through the same client are identical (same provider and account)
+    return f"{id(client)}:{canonical_key(model, messages)}"
+
+
+def completions_create(
+    client, messages: list, model: str, cache: CompletionCache | None = None
+) -> str:
     """
     Sends a request to the client's `completions.create` method to interact with the language model.
 
+    If a completion cache is available (either passed explicitly or set with `set_completion_cache`),
+    identical `(model, messages)` requests are served from it. Requests go through the process-wide
+    rate limiter of the model (see `agentic_patterns.utils.rate_limit`), which also retries them on
+    rate limit errors.
+
+    When enabled with `set_request_coalescing`, identical requests sent concurrently through the
+    same client share a single LLM call: the first one is sent, and the others wait for its
+    response or error.
+
     Args:
         client (Groq): The Groq client object
         messages (list[dict]): A list of message objects containing chat history for the model.
         model (str): The model to use for generating tool calls and responses.
+        cache (CompletionCache | None, optional): The cache to use. Defaults to the global completion cache.
 
     Returns:
         str: The content of the model's response.
     """
-    response = client.chat.completions.create(messages=messages, model=model)
-    return str(response.choices[0].message.content)
+    messages = list(messages)
+    with span("llm.completion", kind="llm", model=model) as llm_span:
+        cache = cache if cache is not None else get_completion_cache()
+        if cache is not None:
+            cached = cache.get(model, messages)
+            llm_span.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return cached
+
+        def request():
+            limiter = get_rate_limiter(provider_of(client), model)
+            tokens = estimate_request_tokens(messages)
+            response = limiter.call(
+                lambda: client.chat.completions.create(messages=messages, model=model),
+                tokens,
+            )
+            limiter.record_usage(tokens, _total_tokens(response))
+            add_usage(_total_tokens(response) or tokens)
+            return response
+
+        coalescer = get_request_coalescer()
+        if coalescer is None:
+            response, shared = request(), False
+        else:
+            key = _coalescing_key(client, model, messages)
+            response, shared = coalescer.do(key, request)
+            llm_span.set_attribute("coalesced", shared)
+        if not shared:
+            record_usage(llm_span, response)
+        content = str(response.choices[0].message.content)
+
+        if cache is not None:
+            cache.set(model, messages, content)
+        return content
+
+
+async def acompletions_create(
+    client, messages: list, model: str, cache: CompletionCache | None = None
+) -> str:
+    """
+    Asynchronous counterpart of `completions_create`, to be used with an async client.
+
+    Args:
+        client (AsyncGroq): The AsyncGroq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        model (str): The model to use for generating tool calls and responses.
+        cache (CompletionCache | None, optional): The cache to use. Defaults to the global completion cache.
+
+    Returns:
+        str: The content of the model's response.
+    """
+    messages = list(messages)
+    with span("llm.completion", kind="llm", model=model) as llm_span:
+        cache = cache if cache is not None else get_completion_cache()
+        if cache is not None:
+            cached = cache.get(model, messages)
+            llm_span.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return cached
+
+        async def request():
+            limiter = get_rate_limiter(provider_of(client), model)
+            tokens = estimate_request_tokens(messages)
+            response = await limiter.acall(
+                lambda: client.chat.completions.create(messages=messages, model=model),
+                tokens,
+            )
+            limiter.record_usage(tokens, _total_tokens(response))
+            add_usage(_total_tokens(response) or tokens)
+            return response
+
+        coalescer = get_request_coalescer()
+        if coalescer is None:
+            response, shared = await request(), False
+        else:
+            key = _coalescing_key(client, model, messages)
+            response, shared = await coalescer.ado(key, request)
+            llm_span.set_attribute("coalesced", shared)
+        if not shared:
+            record_usage(llm_span, response)
+        content = str(response.choices[0].message.content)
+
+        if cache is not None:
+            cache.set(model, messages, content)
+        return content
+
+
+def completions_stream(
+    client, messages: list, model: str, cache: CompletionCache | None = None
+) -> Iterator[str]:
+    """
+    Streaming version of `completions_create`, yielding the content of the model's response chunk by chunk.
+
+    A cached completion is yielded as a single chunk. The completion is only stored in the cache
+    when the stream is fully consumed.
+
+    Args:
+        client (Groq): The Groq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        model (str): The model to use for generating tool calls and responses.
+        cache (CompletionCache | None, optional): The cache to use. Defaults to the global completion cache.
+
+    Yields:
+        str: The content chunks of the model's response.
+    """
+    messages = list(messages)
+    cache = cache if cache is not None else get_completion_cache()
+    if cache is not None:
+        cached = cache.get(model, messages)
+        if cached is not None:
+            yield cached
+            return
+
+    # The span isn't made current: the caller's code runs between the chunks
+    llm_span = start_span("llm.completion", kind="llm", model=model, stream=True)
+    error = None
+    try:
+        limiter = get_rate_limiter(provider_of(client), model)
+        stream = limiter.call(
+            lambda: client.chat.completions.create(
+                messages=messages, model=model, stream=True
+            ),
+            estimate_request_tokens(messages),
+        )
+        chunks = []
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            # Streams don't report their usage: it's estimated
+            add_usage(
+                estimate_request_tokens(messages, estimate_tokens("".join(chunks)))
+            )
+    except GeneratorExit:
+        # The consumer stopped early (e.g. a response tag closed): not an error
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        end_span(llm_span, error)
+
+    if cache is not None:
+        cache.set(model, messages, "".join(chunks))
+
+
+async def acompletions_stream(
+    client, messages: list, model: str, cache: CompletionCache | None = None
+) -> AsyncIterator[str]:
+    """
+    Asynchronous counterpart of `completions_stream`, to be used with an async client.
+
+    Args:
+        client (AsyncGroq): The AsyncGroq client object
+        messages (list[dict]): A list of message objects containing chat history for the model.
+        model (str): The model to use for generating tool calls and responses.
+        cache (CompletionCache | None, optional): The cache to use. Defaults to the global completion cache.
+
+    Yields:
+        str: The content chunks of the model's response.
+    """
+    messages = list(messages)
+    cache = cache if cache is not None else get_completion_cache()
+    if cache is not None:
+        cached = cache.get(model, messages)
+        if cached is not None:
+            yield cached
+            return
+
+    # The span isn't made current: the caller's code runs between the chunks
+    llm_span = start_span("llm.completion", kind="llm", model=model, stream=True)
+    error = None
+    try:
+        limiter = get_rate_limiter(provider_of(client), model)
+        stream = await limiter.acall(
+            lambda: client.chat.completions.create(
+                messages=messages, model=model, stream=True
+            ),
+            estimate_request_tokens(messages),
+        )
+        chunks = []
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    yield delta
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await close()
+            # Streams don't report their usage: it's estimated
+            add_usage(
+                estimate_request_tokens(messages, estimate_tokens("".join(chunks)))
+            )
+    except GeneratorExit:
+        # The consumer stopped early (e.g. a response tag closed): not an error
+        raise
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        end_span(llm_span, error)
+
+    if cache is not None:
+        cache.set(model, messages, "".join(chunks))
 
 
 def build_prompt_structure(prompt: str, role: str, tag: str = "") -> dict:
@@ -86,3 +340,81 @@ class FixedFirstChatHistory(ChatHistory):
         if len(self) == self.total_length:
             self.pop(1)
         super().append(msg)
+
+
+class TokenBudgetChatHistory(Sequence):
+    """
+    A chat history that evicts the oldest messages when the estimated number of tokens exceeds a budget.
+
+    The first `n_pinned` messages (e.g. the system prompt) are never evicted. The rest live in a deque,
+    so appending and evicting are O(1), and the token count of each message is estimated only once.
+    It can be passed anywhere a list of messages is expected (e.g. `completions_create`).
+
+    Attributes:
+        max_tokens (int): The maximum estimated number of tokens of the whole history.
+        n_pinned (int): The number of leading messages that are never evicted.
+        total_tokens (int): The current estimated number of tokens of the history.
+    """
+
+    def __init__(
+        self,
+        messages: list | None = None,
+        max_tokens: int = 8192,
+        n_pinned: int = 1,
+    ):
+        """Initialise the history with a token budget.
+
+        Args:
+            messages (list | None): A list of initial messages
+            max_tokens (int): The maximum estimated number of tokens of the whole history.
+            n_pinned (int): The number of leading messages that are never evicted.
+        """
+        messages = messages or []
+        self.max_tokens = max_tokens
+        self.n_pinned = n_pinned
+
+        self._pinned: list = []
+        self._messages: deque = deque()
+        self._tokens: deque = deque()
+        self.total_tokens = 0
+
+        for msg in messages:
+            self.append(msg)
+
+    def __len__(self) -> int:
+        return len(self._pinned) + len(self._messages)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if 0 <= index < len(self._pinned):
+            return self._pinned[index]
+        return self._messages[index - len(self._pinned)]
+
+    def __iter__(self):
+        return chain(self._pinned, self._messages)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r}, max_tokens={self.max_tokens})"
+
+    def append(self, msg: dict):
+        """Add a message, evicting the oldest unpinned messages while the history is over budget.
+        The latest message is always kept, even if it exceeds the budget by itself.
+
+        Args:
+            msg (dict): The message to be added to the history
+        """
+        tokens = estimate_message_tokens(msg)
+        self.total_tokens += tokens
+        if len(self._pinned) < self.n_pinned:
+            self._pinned.append(msg)
+            return
+
+        self._messages.append(msg)
+        self._tokens.append(tokens)
+
+        while self.total_tokens > self.max_tokens and len(self._messages) > 1:
+            self._messages.popleft()
+            self.total_tokens -= self._tokens.popleft()
@@ -0,0 +1,36 @@
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_config(dotenv_path: str | None = None, override: bool = False) -> bool:
+    """
+    Loads the environment variables of the `.env` file (e.g. `GROQ_API_KEY`) into `os.environ`.
+
+    It runs once per process: the clients call it right before they are created, so importing the
+    package has no side effects and doesn't import `python-dotenv`. Call it yourself to load a
+    specific file, or skip the `.env` file entirely by exporting the variables.
+
+    Args:
+        dotenv_path (str | None, optional): The path of the file. Defaults to the `.env` file found
+                                            by searching from the current directory upwards.
+        override (bool, optional): Whether the file overrides the variables already set.
+
+    Returns:
+        bool: Whether a file was loaded by this call.
+    """
+    global _loaded
+    if _loaded and dotenv_path is None:
+        return False
+    with _lock:
+        if _loaded and dotenv_path is None:
+            return False
+        _loaded = True
+        from dotenv import find_dotenv
+        from dotenv import load_dotenv
+
+        # `find_dotenv` searches from the current directory (the default one searches from the
+        # calling module, which would be this package)
+        path = dotenv_path or find_dotenv(usecwd=True)
+        return bool(path) and load_dotenv(path, override=override)
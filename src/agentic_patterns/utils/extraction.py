@@ -1,5 +1,7 @@
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass
@@ -16,6 +18,22 @@ class TagContentResult:
     found: bool
 
 
+@lru_cache(maxsize=128)
+def _tag_pattern(tag: str) -> re.Pattern:
+    """
+    Compiles (once per tag) the regex pattern matching the content of a tag.
+    """
+    return re.compile(rf"<{re.escape(tag)}>(.*?)</{re.escape(tag)}>", re.DOTALL)
+
+
+@lru_cache(maxsize=128)
+def _opening_tags_pattern(tags: tuple[str, ...]) -> re.Pattern:
+    """
+    Compiles (once per tag set) the regex pattern matching any of the opening tags.
+    """
+    return re.compile("<(" + "|".join(re.escape(tag) for tag in tags) + ")>")
+
+
 def extract_tag_content(text: str, tag: str) -> TagContentResult:
     """
     Extracts all content enclosed by specified tags (e.g., <thought>, <response>, etc.).
@@ -29,14 +47,134 @@ def extract_tag_content(text: str, tag: str) -> TagContentResult:
             - 'content' (list): A list of strings containing the content found between the specified tags.
             - 'found' (bool): A flag indicating whether any content was found for the given tag.
     """
-    # Build the regex pattern dynamically to find multiple occurrences of the tag
-    tag_pattern = rf"<{tag}>(.*?)</{tag}>"
-
     # Use findall to capture all content between the specified tag
-    matched_contents = re.findall(tag_pattern, text, re.DOTALL)
+    matched_contents = _tag_pattern(tag).findall(text)
 
     # Return the dataclass instance with the result
     return TagContentResult(
         content=[content.strip() for content in matched_contents],
         found=bool(matched_contents),
     )
+
+
+class TagParser:
+    """
+    A parser extracting the content of several tags at once from a text that can be fed
+    incrementally, e.g. while a completion is being streamed.
+
+    Each tag is matched like `extract_tag_content` does: from an opening tag to the first closing
+    tag of the same name after it, whatever the other tags in between. Each chunk is scanned
+    once, along with the few characters before it where a tag split across two chunks could start.
+
+    Attributes:
+        tags (tuple[str, ...]): The names of the tags to extract.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        self.tags = tuple(tags)
+        self._chunks: list[str] = []
+        self._contents: dict[str, list[str]] = {tag: [] for tag in self.tags}
+        # The content read so far of each open tag (None if the tag isn't open)
+        self._open: dict[str, list[str] | None] = {tag: None for tag in self.tags}
+        # The absolute position from which each tag is still to be scanned
+        self._positions = {tag: 0 for tag in self.tags}
+        # The end of the text fed before the current chunk, which is kept long enough to hold
+        # the beginning of any (opening or closing) tag split across two chunks
+        self._tail = ""
+        self._tail_size = max(len(tag) for tag in self.tags) + 2
+        self._length = 0
+
+    @property
+    def text(self) -> str:
+        """
+        The text fed so far.
+        """
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        """
+        Adds a chunk of text and returns the tags completed by it.
+
+        Args:
+            chunk (str): The new chunk of text.
+
+        Returns:
+            list[tuple[str, str]]: The `(tag, content)` pairs closed in this chunk, in order of appearance.
+        """
+        self._chunks.append(chunk)
+        window = self._tail + chunk
+        window_start = self._length - len(self._tail)
+        self._length += len(chunk)
+        self._tail = window[-self._tail_size :]
+
+        closed = []
+        for tag in self.tags:
+            closed.extend(self._scan(tag, window, window_start))
+        closed.sort()
+        return [(tag, content) for _, tag, content in closed]
+
+    def _scan(
+        self, tag: str, window: str, window_start: int
+    ) -> list[tuple[int, str, str]]:
+        """
+        Scans the new text for a tag, and returns the `(position, tag, content)` of the tags closed.
+        """
+        opening, closing = f"<{tag}>", f"</{tag}>"
+        closed = []
+        position = max(self._positions[tag] - window_start, 0)
+        while True:
+            contents = self._open[tag]
+            if contents is None:
+                start = window.find(opening, position)
+                if start == -1:
+                    position = max(position, len(window) - len(opening) + 1)
+                    break
+                self._open[tag] = []
+                position = start + len(opening)
+                continue
+
+            end = window.find(closing, position)
+            if end == -1:
+                # Keep the text that might be the beginning of the closing tag for the next chunk
+                safe_end = max(position, len(window) - len(closing) + 1)
+                contents.append(window[position:safe_end])
+                position = safe_end
+                break
+
+            contents.append(window[position:end])
+            content = "".join(contents).strip()
+            self._contents[tag].append(content)
+            closed.append((window_start + end, tag, content))
+            self._open[tag] = None
+            position = end + len(closing)
+
+        self._positions[tag] = window_start + position
+        return closed
+
+    def results(self) -> dict[str, TagContentResult]:
+        """
+        Returns the content of every tag found so far.
+
+        Returns:
+            dict[str, TagContentResult]: A dictionary mapping each tag to its extraction result.
+        """
+        return {
+            tag: TagContentResult(content=list(contents), found=bool(contents))
+            for tag, contents in self._contents.items()
+        }
+
+
+def extract_tags(text: str, tags: Iterable[str]) -> dict[str, TagContentResult]:
+    """
+    Extracts the content of several tags from a text.
+
+    Parameters:
+        text (str): The input string containing multiple potential tags.
+        tags (Iterable[str]): The names of the tags to search for (e.g., 'thought', 'response').
+
+    Returns:
+        dict[str, TagContentResult]: A dictionary mapping each tag to its extraction result.
+    """
+    parser = TagParser(tags)
+    parser.feed(text)
+    return parser.results()
@@ -1,28 +1,103 @@
-import time
+import logging
+import sys
 
-from colorama import Fore
-from colorama import Style
+# Every module logs through a child of this logger (`logging.getLogger(__name__)`), so the whole
+# package can be configured at once. Nothing is shown by default but warnings: the messages are
+# only formatted when a handler is interested in them.
+LOGGER_NAME = "agentic_patterns"
+
+# The `kind` of a record (passed with `extra={"kind": ...}`) tells the console handler how to
+# render it. Other handlers can use it to filter or structure the records.
+KIND_COLORS = {
+    "banner": "MAGENTA",
+    "thought": "MAGENTA",
+    "tool": "GREEN",
+    "observation": "BLUE",
+    "generation": "BLUE",
+    "reflection": "GREEN",
+    "stop": "RED",
+    "output": "RED",
+}
+
+
+class FancyConsoleHandler(logging.StreamHandler):
+    """
+    A handler rendering the records with the colored console output of the original agents:
+    banners for the crew agents and reflection steps, and one color per kind of message.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(stream or sys.stdout)
+        # Imported here, so colorama is only needed when the console output is enabled
+        from colorama import Fore
+        from colorama import Style
+
+        self._fore = Fore
+        self._style = Style
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        kind = getattr(record, "kind", None)
+        if kind == "banner":
+            line = self._style.BRIGHT + self._fore.CYAN + "=" * 50
+            return f"\n{line}\n{self._fore.MAGENTA}{message}\n{line}\n"
+        color = getattr(self._fore, KIND_COLORS.get(kind, ""), "")
+        if record.levelno >= logging.WARNING:
+            color = self._fore.YELLOW
+        return f"{color}\n{message}{self._style.RESET_ALL}"
+
+
+def enable_console_logging(
+    level: int = logging.INFO, stream=None
+) -> FancyConsoleHandler:
+    """
+    Shows the package's messages on the console, with colors. At the INFO level you get the crew
+    agents, thoughts, tool calls and outputs; DEBUG adds the full tool arguments, results and
+    observations.
+
+    Args:
+        level (int, optional): The minimum level of the messages shown. Defaults to `logging.INFO`.
+        stream (optional): The stream to write to. Defaults to `sys.stdout`.
+
+    Returns:
+        FancyConsoleHandler: The installed handler.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    disable_console_logging()
+    handler = FancyConsoleHandler(stream)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+def disable_console_logging():
+    """
+    Removes the handlers installed by `enable_console_logging`.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if isinstance(handler, FancyConsoleHandler):
+            logger.removeHandler(handler)
 
 
 def fancy_print(message: str) -> None:
     """
-    Displays a fancy print message.
+    Logs a message as a banner (at the INFO level).
 
     Args:
         message (str): The message to display.
     """
-    print(Style.BRIGHT + Fore.CYAN + f"\n{'=' * 50}")
-    print(Fore.MAGENTA + f"{message}")
-    print(Style.BRIGHT + Fore.CYAN + f"{'=' * 50}\n")
-    time.sleep(0.5)
+    logging.getLogger(LOGGER_NAME).info(message, extra={"kind": "banner"})
 
 
 def fancy_step_tracker(step: int, total_steps: int) -> None:
     """
-    Displays a fancy step tracker for each iteration of the generation-reflection loop.
+    Logs a banner for each iteration of the generation-reflection loop.
 
     Args:
         step (int): The current step in the loop.
         total_steps (int): The total number of steps in the loop.
     """
-    fancy_print(f"STEP {step + 1}/{total_steps}")
+    logging.getLogger(LOGGER_NAME).info(
+        "STEP %d/%d", step + 1, total_steps, extra={"kind": "banner"}
+    )
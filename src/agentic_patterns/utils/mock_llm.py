@@ -0,0 +1,281 @@
+import asyncio
+import json
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from dataclasses import field
+
+from agentic_patterns.utils.cache import canonical_key
+from agentic_patterns.utils.tokens import estimate_messages_tokens
+from agentic_patterns.utils.tokens import estimate_tokens
+
+
+@dataclass
+class MockMessage:
+    role: str
+    content: str
+
+
+@dataclass
+class MockChoice:
+    index: int
+    message: MockMessage | None = None
+    delta: MockMessage | None = None
+    finish_reason: str | None = None
+
+
+@dataclass
+class MockUsage:
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class MockCompletion:
+    """
+    A completion (or a streamed chunk) mimicking the objects returned by the Groq client.
+    """
+
+    model: str
+    choices: list[MockChoice]
+    usage: MockUsage | None = None
+
+
+@dataclass
+class MockLLMClient:
+    """
+    A deterministic, local stand-in for the Groq client, implementing `chat.completions.create`.
+    It makes it possible to run (and benchmark) the agents without network access.
+
+    The responses come from one of these sources, checked in this order:
+
+    - `replay`: a dictionary mapping `canonical_key(model, messages)` to a response, usually
+      loaded from a recording with `from_recording`.
+    - `responder`: a function receiving `(messages, model)` and returning the response.
+    - `responses`: a list of scripted responses, returned in order (cycling when exhausted).
+
+    Latency is simulated with a fixed delay before the first token (`latency`) plus a
+    generation time given by `tokens_per_second`.
+
+    Attributes:
+        responses (list[str]): The scripted responses.
+        responder (Callable | None): A function computing the response from `(messages, model)`.
+        replay (dict[str, str]): Recorded responses, keyed by the canonical request key.
+        latency (float): Seconds to wait before the first token.
+        tokens_per_second (float | None): The simulated generation speed. None means instantaneous.
+        calls (int): The number of requests served.
+    """
+
+    responses: list[str] = field(default_factory=lambda: ["<response>OK</response>"])
+    responder: Callable[[list, str], str] | None = None
+    replay: dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    tokens_per_second: float | None = None
+    calls: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self.chat = _Chat(_Completions(self))
+
+    def __getstate__(self):
+        # The lock and the `chat` namespace are rebuilt on unpickling, so the client can be
+        # sent to worker processes (each process then counts its own `calls`)
+        state = dict(self.__dict__)
+        del state["_lock"], state["chat"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs) -> "MockLLMClient":
+        """
+        Builds a client replaying the responses recorded in a JSON-lines file, where each line
+        has a `key` (see `canonical_key`) and a `response`.
+
+        Args:
+            path (str): The path of the recording.
+            **kwargs: Extra attributes of the client (e.g. `latency`).
+
+        Returns:
+            MockLLMClient: The replaying client.
+        """
+        replay = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    replay[record["key"]] = record["response"]
+        return cls(replay=replay, **kwargs)
+
+    def respond(self, messages: list, model: str) -> str:
+        """
+        Computes the response to a request, without simulating any latency.
+
+        Args:
+            messages (list[dict]): The messages of the request.
+            model (str): The model of the request.
+
+        Returns:
+            str: The response content.
+
+        Raises:
+            KeyError: If the client only replays recordings and the request wasn't recorded.
+        """
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+
+        if self.replay:
+            key = canonical_key(model, messages)
+            if key in self.replay:
+                return self.replay[key]
+            if self.responder is None:
+                raise KeyError(f"No recorded response for request {key}")
+        if self.responder is not None:
+            return self.responder(messages, model)
+        return self.responses[index % len(self.responses)]
+
+    def generation_time(self, content: str) -> float:
+        """
+        Returns the simulated time needed to generate a response, first token latency excluded.
+        """
+        if not self.tokens_per_second:
+            return 0.0
+        return estimate_tokens(content) / self.tokens_per_second
+
+    def _completion(self, messages: list, model: str, content: str) -> MockCompletion:
+        prompt_tokens = estimate_messages_tokens(messages)
+        completion_tokens = estimate_tokens(content)
+        return MockCompletion(
+            model=model,
+            choices=[
+                MockChoice(
+                    index=0,
+                    message=MockMessage(role="assistant", content=content),
+                    finish_reason="stop",
+                )
+            ],
+            usage=MockUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    def _chunks(self, content: str, chunk_size: int = 16) -> list[str]:
+        return [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def _chunk(self, model: str, delta: str) -> MockCompletion:
+        return MockCompletion(
+            model=model,
+            choices=[
+                MockChoice(index=0, delta=MockMessage(role="assistant", content=delta))
+            ],
+        )
+
+
+class AsyncMockLLMClient(MockLLMClient):
+    """
+    The asynchronous counterpart of `MockLLMClient`, mimicking the AsyncGroq client.
+    Latency is simulated with `asyncio.sleep`, so many requests can overlap on one event loop.
+    """
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self.chat = _Chat(_AsyncCompletions(self))
+
+
+class _Chat:
+    def __init__(self, completions):
+        self.completions = completions
+
+
+class _Completions:
+    def __init__(self, client: MockLLMClient):
+        self._client = client
+
+    def create(self, messages: Iterable, model: str, stream: bool = False, **kwargs):
+        messages = list(messages)
+        content = self._client.respond(messages, model)
+        if self._client.latency:
+            time.sleep(self._client.latency)
+
+        if not stream:
+            time.sleep(self._client.generation_time(content))
+            return self._client._completion(messages, model, content)
+
+        return self._stream(model, content)
+
+    def _stream(self, model: str, content: str):
+        chunks = self._client._chunks(content)
+        delay = self._client.generation_time(content) / max(len(chunks), 1)
+        for delta in chunks:
+            if delay:
+                time.sleep(delay)
+            yield self._client._chunk(model, delta)
+
+
+class _AsyncCompletions:
+    def __init__(self, client: MockLLMClient):
+        self._client = client
+
+    async def create(
+        self, messages: Iterable, model: str, stream: bool = False, **kwargs
+    ):
+        messages = list(messages)
+        content = self._client.respond(messages, model)
+        if self._client.latency:
+            await asyncio.sleep(self._client.latency)
+
+        if not stream:
+            await asyncio.sleep(self._client.generation_time(content))
+            return self._client._completion(messages, model, content)
+
+        return self._stream(model, content)
+
+    async def _stream(self, model: str, content: str):
+        chunks = self._client._chunks(content)
+        delay = self._client.generation_time(content) / max(len(chunks), 1)
+        for delta in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield self._client._chunk(model, delta)
+
+
+class RecordingClient:
+    """
+    Wraps a real client, appending every `(request key, response)` pair to a JSON-lines file
+    that `MockLLMClient.from_recording` can replay later.
+
+    Attributes:
+        client: The wrapped client.
+        path (str): The path of the recording.
+    """
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = _Chat(self)
+
+    def create(self, messages: Iterable, model: str, **kwargs):
+        messages = list(messages)
+        response = self.client.chat.completions.create(
+            messages=messages, model=model, **kwargs
+        )
+        if kwargs.get("stream"):
+            # Streams are passed through untouched: only full completions are recorded
+            return response
+
+        record = {
+            "key": canonical_key(model, messages),
+            "response": str(response.choices[0].message.content),
+        }
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return response
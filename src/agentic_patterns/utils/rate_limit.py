@@ -0,0 +1,407 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Any
+from typing import TypeVar
+
+from agentic_patterns.utils.tokens import estimate_messages_tokens
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORITY = 10
+DEFAULT_COMPLETION_TOKENS = 512
+RATE_LIMIT_STATUS_CODES = frozenset({429})
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "rate_limit_priority", default=DEFAULT_PRIORITY
+)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Sets the priority of the LLM requests made inside the block (lower values go first, like the
+    `priority` hints of the crew agents). The priority follows the code into `asyncio` tasks and
+    `asyncio.to_thread` calls.
+
+    Args:
+        priority (int): The priority of the requests. The default priority is 10.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `rate` units per second, up to `capacity`.
+
+    Attributes:
+        rate (float): The refill rate, in units per second.
+        capacity (float): The maximum number of units the bucket holds.
+        available (float): The units currently available. It can go negative when the actual
+                           usage of a request exceeds its estimate.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.available = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.available = min(
+            self.capacity, self.available + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Returns the seconds to wait before `amount` units are available (0 if they already are).
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float):
+        self.available -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """
+        Gives back (or takes, if negative) units, e.g. once the real token usage is known.
+        """
+        self.available = min(self.capacity, self.available + amount)
+
+
+class _Ticket:
+    """
+    A request waiting for its turn. Sync waiters block on a `threading.Event`; async waiters on
+    an `asyncio.Event` of their own loop, set in a thread-safe way.
+    """
+
+    def __init__(self, tokens: int, loop: asyncio.AbstractEventLoop | None = None):
+        self.tokens = tokens
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+def _retry_after(error: Exception) -> float | None:
+    """
+    Reads the `retry-after` header of a rate limit error, in seconds.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Checks whether an exception is a rate limit error (HTTP 429) of the Groq or OpenAI clients.
+    """
+    return (
+        getattr(error, "status_code", None) in RATE_LIMIT_STATUS_CODES
+        or type(error).__name__ == "RateLimitError"
+    )
+
+
+class RateLimiter:
+    """
+    Throttles the requests sent to one model of one provider, shared by every agent of the process.
+
+    Two token buckets enforce the requests-per-minute and tokens-per-minute limits (each is optional).
+    Requests wait in a priority queue, so they are served by priority and then in arrival order, and a
+    big request at the head of the queue isn't starved by a stream of small ones.
+
+    When the provider answers with a rate limit error anyway, the request is retried after the
+    `retry-after` delay the provider asked for or, without it, an exponential backoff with full
+    jitter. The whole limiter holds off during that delay, so other agents don't keep hammering
+    the provider.
+
+    Attributes:
+        requests_per_minute (float | None): The maximum number of requests per minute.
+        tokens_per_minute (float | None): The maximum number of (estimated) tokens per minute.
+        max_retries (int): The maximum number of retries of a rate-limited request.
+        base_delay (float): The backoff delay of the first retry, in seconds.
+        max_delay (float): The maximum backoff delay, in seconds.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._requests = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute)
+            if requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self._lock = threading.Lock()
+        self._queue: list[tuple[int, int, _Ticket]] = []
+        self._counter = itertools.count()
+        self._blocked_until = 0.0
+
+    def _enqueue(self, ticket: _Ticket, priority: int | None):
+        priority = _priority.get() if priority is None else priority
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._counter), ticket))
+
+    def _try_acquire(self, ticket: _Ticket) -> float | None:
+        """
+        Takes the ticket's request and tokens if it's at the head of the queue and they are available.
+
+        Returns:
+            float | None: 0 if acquired, the seconds to wait before the next attempt if the ticket is
+                          at the head of the queue, or None if it must wait for its turn.
+        """
+        with self._lock:
+            if self._queue[0][2] is not ticket:
+                return None
+
+            now = time.monotonic()
+            wait = self._blocked_until - now
+            for bucket, amount in ((self._requests, 1), (self._tokens, ticket.tokens)):
+                if bucket is not None:
+                    wait = max(wait, bucket.wait_time(amount, now))
+            if wait > 0:
+                return wait
+
+            for bucket, amount in ((self._requests, 1), (self._tokens, ticket.tokens)):
+                if bucket is not None:
+                    bucket.consume(amount)
+            heapq.heappop(self._queue)
+            if self._queue:
+                self._queue[0][2].wake()
+            return 0.0
+
+    def _withdraw(self, ticket: _Ticket):
+        # A waiter that gives up (e.g. a cancelled task) must not block the queue
+        with self._lock:
+            was_head = self._queue and self._queue[0][2] is ticket
+            self._queue = [entry for entry in self._queue if entry[2] is not ticket]
+            heapq.heapify(self._queue)
+            if was_head and self._queue:
+                self._queue[0][2].wake()
+
+    def acquire(self, tokens: int = 0, priority: int | None = None):
+        """
+        Blocks until the request can be sent.
+
+        Args:
+            tokens (int, optional): The estimated tokens of the request (prompt and completion).
+            priority (int | None, optional): The priority of the request. Defaults to the one set
+                                             with `request_priority`.
+        """
+        ticket = _Ticket(tokens)
+        self._enqueue(ticket, priority)
+        try:
+            while (wait := self._try_acquire(ticket)) != 0:
+                ticket.event.wait(wait)
+                ticket.event.clear()
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+
+    async def aacquire(self, tokens: int = 0, priority: int | None = None):
+        """
+        Asynchronous version of `acquire`, waiting without blocking the event loop.
+        """
+        ticket = _Ticket(tokens, loop=asyncio.get_running_loop())
+        self._enqueue(ticket, priority)
+        try:
+            while (wait := self._try_acquire(ticket)) != 0:
+                try:
+                    await asyncio.wait_for(ticket.event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                ticket.event.clear()
+        except BaseException:
+            self._withdraw(ticket)
+            raise
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int | None):
+        """
+        Corrects the token bucket with the real usage of a request, once it's known.
+        """
+        if self._tokens is not None and actual_tokens is not None:
+            with self._lock:
+                self._tokens.adjust(estimated_tokens - actual_tokens)
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Computes the delay before retrying a rate-limited request, and holds off every other request
+        of this limiter for that long.
+
+        Args:
+            attempt (int): The number of the retry, starting at 0.
+            error (Exception): The rate limit error.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        logger.warning(
+            "Rate limited (retry %d/%d), retrying in %.2fs",
+            attempt + 1,
+            self.max_retries,
+            delay,
+        )
+        return delay
+
+    def call(
+        self, fn: Callable[[], T], tokens: int = 0, priority: int | None = None
+    ) -> T:
+        """
+        Calls `fn` once the limiter allows it, retrying it on rate limit errors.
+
+        Args:
+            fn (Callable): The function sending the request.
+            tokens (int, optional): The estimated tokens of the request.
+            priority (int | None, optional): The priority of the request.
+
+        Returns:
+            The result of `fn`.
+        """
+        for attempt in itertools.count():
+            self.acquire(tokens, priority)
+            try:
+                return fn()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.backoff(attempt, e))
+        raise AssertionError("unreachable")
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        priority: int | None = None,
+    ) -> T:
+        """
+        Asynchronous version of `call`, for a function returning an awaitable.
+        """
+        for attempt in itertools.count():
+            await self.aacquire(tokens, priority)
+            try:
+                return await fn()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff(attempt, e))
+        raise AssertionError("unreachable")
+
+
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def provider_of(client: Any) -> str:
+    """
+    Returns the provider name used to key the rate limiters of a client: its `provider` attribute
+    if it has one, otherwise the top-level package of its class (e.g. "groq" or "openai").
+    """
+    return getattr(client, "provider", None) or type(client).__module__.split(".")[0]
+
+
+def configure_rate_limit(
+    model: str,
+    provider: str = "groq",
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+    **kwargs,
+) -> RateLimiter:
+    """
+    Sets the limits of a model of a provider, for every agent of the process.
+
+    Args:
+        model (str): The model, e.g. "llama-3.3-70b-versatile".
+        provider (str, optional): The provider. Defaults to "groq".
+        requests_per_minute (float | None, optional): The maximum number of requests per minute.
+        tokens_per_minute (float | None, optional): The maximum number of tokens per minute.
+        **kwargs: The retry settings of the `RateLimiter` (`max_retries`, `base_delay`, `max_delay`).
+
+    Returns:
+        RateLimiter: The new limiter.
+    """
+    limiter = RateLimiter(requests_per_minute, tokens_per_minute, **kwargs)
+    with _limiters_lock:
+        _limiters[provider, model] = limiter
+    return limiter
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """
+    Returns the limiter shared by all the requests to a model of a provider. Models without
+    configured limits get a limiter that doesn't throttle but still backs off on rate limit errors.
+
+    Args:
+        provider (str): The provider.
+        model (str): The model.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    limiter = _limiters.get((provider, model))
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault((provider, model), RateLimiter())
+    return limiter
+
+
+def estimate_request_tokens(
+    messages: list, completion_tokens: int = DEFAULT_COMPLETION_TOKENS
+) -> int:
+    """
+    Estimates the tokens a request counts against the tokens-per-minute limit, which includes the
+    completion the model is yet to produce.
+
+    Args:
+        messages (list[dict]): The messages of the request.
+        completion_tokens (int, optional): The expected size of the completion.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return estimate_messages_tokens(messages) + completion_tokens
@@ -0,0 +1,369 @@
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterable
+
+from agentic_patterns.utils.clients import ClientRegistry
+from agentic_patterns.utils.clients import get_async_client
+from agentic_patterns.utils.clients import get_client
+from agentic_patterns.utils.rate_limit import estimate_request_tokens
+from agentic_patterns.utils.rate_limit import get_rate_limiter
+
+# HTTP status codes that mean the request itself is wrong: retrying it elsewhere won't help
+NON_RETRYABLE_STATUS_CODES = frozenset({400, 401, 403, 404, 422})
+
+
+class Endpoint:
+    """
+    A provider the router can send requests to: Groq, or any server exposing the OpenAI chat
+    completions API (OpenAI itself, vLLM, llama.cpp, Ollama ...).
+
+    Attributes:
+        name (str): A unique name, used in the stats and the logs.
+        model (str | None): The model served by this endpoint. When None, the model of the request is
+                            used unchanged.
+        provider (str): The provider name keying the rate limiters of this endpoint (see
+                        `configure_rate_limit`). Defaults to the endpoint name.
+        latency (float | None): The exponentially weighted moving average of the request latency, in
+                                seconds. None until the first successful request.
+        error_rate (float): The exponentially weighted moving average of the error rate.
+        consecutive_failures (int): The number of failures since the last successful request.
+        unhealthy_until (float): The `time.monotonic()` value until which the endpoint is skipped.
+        in_flight (int): The number of requests currently being served.
+        probing (bool): Whether a request is probing the endpoint after its cooldown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client_factory: Callable,
+        async_client_factory: Callable | None = None,
+        model: str | None = None,
+        provider: str | None = None,
+    ):
+        self.name = name
+        self.model = model
+        self.provider = provider or name
+        self._client_factory = client_factory
+        self._async_client_factory = async_client_factory
+
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.in_flight = 0
+        self.probing = False
+
+    @classmethod
+    def groq(cls, name: str = "groq", model: str | None = None, **client_kwargs):
+        """
+        Builds a Groq endpoint. Without extra arguments it uses the process-wide shared clients,
+        and shares the "groq" rate limiters with the requests sent to them directly.
+
+        Args:
+            name (str, optional): The name of the endpoint. Defaults to "groq".
+            model (str | None, optional): The model to use instead of the requested one.
+            **client_kwargs: Keyword arguments of a dedicated Groq client (e.g. `api_key`).
+
+        Returns:
+            Endpoint: The Groq endpoint.
+        """
+        if not client_kwargs:
+            return cls(name, get_client, get_async_client, model=model, provider="groq")
+        registry = ClientRegistry(**client_kwargs)
+        return cls(name, registry.get_client, registry.get_async_client, model=model)
+
+    @classmethod
+    def openai_compatible(
+        cls,
+        name: str,
+        base_url: str,
+        api_key: str | None = None,
+        model: str | None = None,
+        **client_kwargs,
+    ):
+        """
+        Builds an endpoint for a server exposing the OpenAI API, e.g. a local vLLM server with
+        `base_url="http://localhost:8000/v1"`. Requires the `openai` package.
+
+        Args:
+            name (str): The name of the endpoint.
+            base_url (str): The base URL of the API.
+            api_key (str | None, optional): The API key. Local servers usually accept any value.
+            model (str | None, optional): The model to use instead of the requested one.
+            **client_kwargs: Extra keyword arguments passed to the OpenAI clients.
+
+        Returns:
+            Endpoint: The OpenAI-compatible endpoint.
+        """
+        try:
+            from openai import AsyncOpenAI
+            from openai import OpenAI
+        except ImportError as e:
+            raise ImportError(
+                "OpenAI-compatible endpoints require the openai package: "
+                "pip install openai"
+            ) from e
+
+        registry = ClientRegistry(
+            client_cls=OpenAI,
+            async_client_cls=AsyncOpenAI,
+            base_url=base_url,
+            api_key=api_key or "not-needed",
+            **client_kwargs,
+        )
+        return cls(name, registry.get_client, registry.get_async_client, model=model)
+
+    @property
+    def client(self):
+        return self._client_factory()
+
+    @property
+    def async_client(self):
+        if self._async_client_factory is None:
+            raise RuntimeError(f"Endpoint {self.name} has no async client")
+        return self._async_client_factory()
+
+    def __repr__(self):
+        return f"Endpoint(name={self.name!r}, model={self.model!r})"
+
+
+def _total_tokens(response) -> int | None:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None)
+
+
+def _is_retryable(error: Exception) -> bool:
+    return getattr(error, "status_code", None) not in NON_RETRYABLE_STATUS_CODES
+
+
+class Router:
+    """
+    A client that spreads chat completion requests over several endpoints. It can be passed as
+    the `client` of any agent, since it exposes the same `chat.completions.create` method as the
+    Groq client (use `router.async_client` as the `async_client`).
+
+    Each request goes to the healthy endpoint with the lowest expected latency, estimated with an
+    exponentially weighted moving average and scaled by the requests already in flight. Endpoints
+    that were never used are tried first, so every endpoint gets measured. When a request fails it
+    is retried on the next best endpoint, and an endpoint failing `failure_threshold` times in a row
+    is taken out of rotation for `cooldown` seconds, after which it gets a single probe request.
+
+    Every request is throttled by the rate limiter of the endpoint it's sent to, keyed by the
+    endpoint's `provider` and model. The limiter `completions_create` applies to the router itself
+    (the "router" provider) has no limits unless configured, and only retries the requests that
+    failed on every endpoint with a rate limit error.
+
+    Attributes:
+        endpoints (list[Endpoint]): The endpoints to route to.
+        alpha (float): The weight of the newest sample in the moving averages.
+        failure_threshold (int): The number of consecutive failures marking an endpoint unhealthy.
+        cooldown (float): The number of seconds an unhealthy endpoint is skipped.
+        max_attempts (int): The maximum number of endpoints tried for a single request.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        max_attempts: int | None = None,
+    ):
+        if not endpoints:
+            raise ValueError("A router needs at least one endpoint")
+        names = [endpoint.name for endpoint in endpoints]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Endpoint names must be unique, got {names}")
+
+        self.endpoints = endpoints
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_attempts = max_attempts or len(endpoints)
+
+        self._lock = threading.Lock()
+        self.provider = "router"
+        self.chat = _Chat(_RouterCompletions(self))
+        self.async_client = _AsyncRouterClient(self)
+
+    def _score(self, endpoint: Endpoint) -> tuple[float, int]:
+        # Ties (e.g. between endpoints never used) go to the least busy endpoint
+        if endpoint.latency is None:
+            return 0.0, endpoint.in_flight
+        load = 1 + endpoint.in_flight
+        return endpoint.latency * load * (1 + endpoint.error_rate), endpoint.in_flight
+
+    def ranked_endpoints(self) -> list[Endpoint]:
+        """
+        Returns the endpoints in the order they would be tried for the next request: the healthy ones
+        from the fastest to the slowest, followed by the unhealthy ones from the first to recover.
+
+        Returns:
+            list[Endpoint]: The ranked endpoints.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.unhealthy_until <= now]
+            unhealthy = [e for e in self.endpoints if e.unhealthy_until > now]
+            healthy.sort(key=self._score)
+            unhealthy.sort(key=lambda e: e.unhealthy_until)
+        return healthy + unhealthy
+
+    def _start(self, endpoint: Endpoint) -> bool | None:
+        """
+        Counts a new request in flight on an endpoint.
+
+        Returns:
+            bool | None: Whether the request is the probe of an endpoint whose cooldown is over, or
+                         None if another request is already probing it (it must then be skipped).
+        """
+        with self._lock:
+            recovering = (
+                endpoint.consecutive_failures >= self.failure_threshold
+                and endpoint.unhealthy_until <= time.monotonic()
+            )
+            if recovering and endpoint.probing:
+                return None
+            if recovering:
+                endpoint.probing = True
+            endpoint.in_flight += 1
+            return recovering
+
+    def _finish(self, endpoint: Endpoint, probe: bool):
+        with self._lock:
+            endpoint.in_flight -= 1
+            if probe:
+                endpoint.probing = False
+
+    def _record_success(self, endpoint: Endpoint, latency: float):
+        with self._lock:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.alpha * (latency - endpoint.latency)
+            endpoint.error_rate *= 1 - self.alpha
+            endpoint.consecutive_failures = 0
+            endpoint.unhealthy_until = 0.0
+
+    def _record_failure(self, endpoint: Endpoint, error: Exception):
+        with self._lock:
+            if not _is_retryable(error):
+                return
+            endpoint.error_rate += self.alpha * (1 - endpoint.error_rate)
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.unhealthy_until = time.monotonic() + self.cooldown
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Returns the current statistics of every endpoint.
+
+        Returns:
+            dict[str, dict]: A dictionary mapping each endpoint name to its latency, error rate,
+                             requests in flight and health.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                endpoint.name: {
+                    "latency": endpoint.latency,
+                    "error_rate": endpoint.error_rate,
+                    "in_flight": endpoint.in_flight,
+                    "healthy": endpoint.unhealthy_until <= now,
+                }
+                for endpoint in self.endpoints
+            }
+
+
+class _Chat:
+    def __init__(self, completions):
+        self.completions = completions
+
+
+class _RouterCompletions:
+    def __init__(self, router: Router):
+        self._router = router
+
+    def create(self, messages: Iterable, model: str, **kwargs):
+        """
+        Sends the request to the best endpoint, failing over to the next ones on errors.
+        For streams, only the time to open the stream is measured and failover can't happen once
+        chunks have been received.
+        """
+        router = self._router
+        messages = list(messages)
+        tokens = estimate_request_tokens(messages)
+        last_error: Exception | None = None
+        for endpoint in router.ranked_endpoints()[: router.max_attempts]:
+            probe = router._start(endpoint)
+            if probe is None:
+                continue
+            limiter = get_rate_limiter(endpoint.provider, endpoint.model or model)
+            try:
+                limiter.acquire(tokens)
+                start = time.perf_counter()
+                response = endpoint.client.chat.completions.create(
+                    messages=messages, model=endpoint.model or model, **kwargs
+                )
+            except Exception as e:
+                router._record_failure(endpoint, e)
+                if not _is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            finally:
+                router._finish(endpoint, probe)
+            router._record_success(endpoint, time.perf_counter() - start)
+            limiter.record_usage(tokens, _total_tokens(response))
+            return response
+        if last_error is None:
+            raise RuntimeError(
+                "Every endpoint is already being probed after its cooldown"
+            )
+        raise last_error
+
+
+class _AsyncRouterCompletions(_RouterCompletions):
+    async def create(self, messages: Iterable, model: str, **kwargs):
+        router = self._router
+        messages = list(messages)
+        tokens = estimate_request_tokens(messages)
+        last_error: Exception | None = None
+        for endpoint in router.ranked_endpoints()[: router.max_attempts]:
+            probe = router._start(endpoint)
+            if probe is None:
+                continue
+            limiter = get_rate_limiter(endpoint.provider, endpoint.model or model)
+            try:
+                await limiter.aacquire(tokens)
+                start = time.perf_counter()
+                response = await endpoint.async_client.chat.completions.create(
+                    messages=messages, model=endpoint.model or model, **kwargs
+                )
+            except Exception as e:
+                router._record_failure(endpoint, e)
+                if not _is_retryable(e):
+                    raise
+                last_error = e
+                continue
+            finally:
+                router._finish(endpoint, probe)
+            router._record_success(endpoint, time.perf_counter() - start)
+            limiter.record_usage(tokens, _total_tokens(response))
+            return response
+        if last_error is None:
+            raise RuntimeError(
+                "Every endpoint is already being probed after its cooldown"
+            )
+        raise last_error
+
+
+class _AsyncRouterClient:
+    """
+    The async face of a `Router`, sharing its endpoints and statistics.
+    """
+
+    def __init__(self, router: Router):
+        self.provider = router.provider
+        self.chat = _Chat(_AsyncRouterCompletions(router))
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from collections.abc import Awaitable
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key: the first caller (the leader) runs the call, and every
+    caller arriving while it's in flight waits for it and gets the same result, or the same exception.
+    Once the call finishes, the next caller with that key starts a new one.
+
+    Sync callers (`do`) can be in any thread. Async callers (`ado`) are only coalesced with the other
+    callers of their event loop, and the call runs in a task of its own, so a cancelled caller doesn't
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._async_calls: dict[tuple[int, str], asyncio.Task] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> tuple[T, bool]:
+        """
+        Runs `fn`, unless a call with the same key is already in flight.
+
+        Args:
+            key (str): The key identifying identical calls.
+            fn (Callable): The function making the call.
+
+        Returns:
+            tuple: The result and whether it was shared with (i.e. computed by) another caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result(), False
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Asynchronous version of `do`, for a function returning an awaitable.
+        """
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            task = self._async_calls.get(loop_key)
+            leader = task is None or task.done()
+            if leader:
+                task = self._async_calls[loop_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda done: self._forget(loop_key, done))
+
+        return await asyncio.shield(task), not leader
+
+    def _forget(self, loop_key: tuple[int, str], task: asyncio.Task):
+        with self._lock:
+            if self._async_calls.get(loop_key) is task:
+                del self._async_calls[loop_key]
+
+
+_request_coalescer: SingleFlight | None = None
+
+
+def set_request_coalescing(enabled: bool):
+    """
+    Enables or disables (it's disabled by default) the coalescing of identical concurrent requests
+    in `completions_create` and `acompletions_create`. Coalesced requests get the same completion,
+    so only enable it when the requests aren't meant as independent samples of the model.
+
+    Args:
+        enabled (bool): Whether identical concurrent requests share a single LLM call.
+    """
+    global _request_coalescer
+    _request_coalescer = SingleFlight() if enabled else None
+
+
+def get_request_coalescer() -> SingleFlight | None:
+    """
+    Returns the coalescer used by `completions_create`, or None if coalescing is disabled.
+    """
+    return _request_coalescer
@@ -0,0 +1,98 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+
+# A rough but cheap approximation: English text averages ~4 characters per token
+# with the Llama tokenizers, and each chat message carries a few tokens of framing.
+CHARS_PER_TOKEN = 4
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens of a text without running a tokenizer.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: dict) -> int:
+    """
+    Estimates the number of tokens a chat message takes in the prompt, including its framing.
+
+    Args:
+        message (dict): A message with (at least) a `content` key.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return estimate_tokens(str(message.get("content") or "")) + MESSAGE_TOKEN_OVERHEAD
+
+
+def estimate_messages_tokens(messages) -> int:
+    """
+    Estimates the number of tokens of a list of chat messages.
+
+    Args:
+        messages (list[dict]): The messages to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return sum(estimate_message_tokens(message) for message in messages)
+
+
+class UsageMeter:
+    """
+    Counts the LLM requests and tokens spent inside a `measure_usage` block, including the ones
+    made by the threads and tasks started from it (as long as they copy the context).
+
+    Attributes:
+        requests (int): The number of requests sent to a provider (cache hits excluded).
+        tokens (int): The total tokens of the requests, as reported by the provider (or estimated).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, tokens: int):
+        with self._lock:
+            self.requests += 1
+            self.tokens += tokens
+
+
+_usage_meters: contextvars.ContextVar[tuple[UsageMeter, ...]] = contextvars.ContextVar(
+    "usage_meters", default=()
+)
+
+
+@contextmanager
+def measure_usage():
+    """
+    Measures the LLM usage of a block. Blocks can be nested: a request counts in every
+    enclosing block.
+
+    Yields:
+        UsageMeter: The meter of the block.
+    """
+    meter = UsageMeter()
+    token = _usage_meters.set(_usage_meters.get() + (meter,))
+    try:
+        yield meter
+    finally:
+        _usage_meters.reset(token)
+
+
+def add_usage(tokens: int):
+    """
+    Records a request, and its tokens, in the meters of the enclosing `measure_usage` blocks.
+    """
+    for meter in _usage_meters.get():
+        meter.add(tokens)
@@ -0,0 +1,435 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Protocol
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """
+    A timed operation (an LLM call, a tool call, a ReAct round ...), linked to the span that was
+    active when it started.
+
+    Attributes:
+        name (str): The name of the operation, e.g. "llm.completion" or "tool.call".
+        kind (str): The kind of operation: "llm" for requests to a model, "internal" otherwise.
+        trace_id (str): The id shared by all the spans of a trace, as 32 hex characters.
+        span_id (str): The id of the span, as 16 hex characters.
+        parent_id (str | None): The id of the parent span, None for the root of a trace.
+        start_time_ns (int): The start time, in nanoseconds since the epoch.
+        end_time_ns (int | None): The end time, None while the span is running.
+        attributes (dict): The details of the operation (model, tokens, cache hits ...).
+        error (str | None): The error that ended the span, if any.
+    """
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_time_ns: int
+    end_time_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """
+    The span handed out while tracing is disabled: every operation on it does nothing, so the
+    instrumented code pays for little more than a function call.
+    """
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span): ...
+
+    def shutdown(self): ...
+
+
+class InMemoryExporter:
+    """
+    Keeps the finished spans in a list, e.g. to inspect them at the end of a notebook run.
+
+    Attributes:
+        spans (list[Span]): The finished spans, in the order they ended.
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+    def summary(self) -> dict[str, dict]:
+        return summarize_spans(self.spans)
+
+
+class JSONLinesExporter:
+    """
+    Appends every finished span to a JSON-lines file, one span per line.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list[Span], service_name: str = "agentic_patterns") -> dict:
+    """
+    Converts spans into an OTLP/JSON `ExportTraceServiceRequest`, the payload OpenTelemetry
+    collectors accept on `/v1/traces`.
+
+    Args:
+        spans (list[Span]): The spans to convert.
+        service_name (str, optional): The `service.name` of the resource.
+
+    Returns:
+        dict: The OTLP/JSON payload.
+    """
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            # 3 is SPAN_KIND_CLIENT (a request to a model), 1 is SPAN_KIND_INTERNAL
+            "kind": 3 if span.kind == "llm" else 1,
+            "startTimeUnixNano": str(span.start_time_ns),
+            "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in span.attributes.items()
+                if value is not None
+            ],
+            "status": (
+                {"code": 2, "message": span.error} if span.error else {"code": 1}
+            ),
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "agentic_patterns"}, "spans": otlp_spans}
+                ],
+            }
+        ]
+    }
+
+
+class OTLPExporter:
+    """
+    Sends the spans, in batches, to an OpenTelemetry collector (or anything accepting OTLP/JSON
+    over HTTP, such as Jaeger or a local stand-in).
+
+    Export errors are reported as warnings: losing traces must never break the agents.
+
+    Attributes:
+        endpoint (str): The URL spans are posted to.
+        service_name (str): The `service.name` of the exported resource.
+        batch_size (int): The number of spans sent per request.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "agentic_patterns",
+        batch_size: int = 64,
+        headers: dict | None = None,
+        timeout: float = 5.0,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        import httpx
+
+        self._client = httpx.Client(headers=headers, timeout=timeout)
+        self._buffer: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._send(batch)
+
+    def _send(self, batch: list[Span]):
+        import httpx
+
+        try:
+            response = self._client.post(
+                self.endpoint, json=to_otlp(batch, self.service_name)
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            warnings.warn(f"Failed to export {len(batch)} spans: {e}")
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._send(batch)
+
+    def shutdown(self):
+        self.flush()
+        self._client.close()
+
+
+class Tracer:
+    """
+    Creates the spans and hands the finished ones to the exporters.
+
+    Attributes:
+        exporters (list[SpanExporter]): The exporters receiving every finished span.
+    """
+
+    def __init__(self, exporters: list[SpanExporter] | None = None):
+        self.exporters = list(exporters or [])
+
+    def start_span(self, name: str, kind: str = "internal", **attributes) -> Span:
+        """
+        Starts a span, child of the current one, without making it the current span. Use it for
+        operations that can't be wrapped in a `with` block, such as a generator being consumed.
+        """
+        parent = _current_span.get()
+        return Span(
+            name=name,
+            kind=kind,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_time_ns=time.time_ns(),
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span, error: BaseException | None = None):
+        span.end_time_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "internal", **attributes):
+        """
+        Runs the body of the `with` block in a new span, which is the parent of the spans started
+        inside it (including in `asyncio` tasks and in threads started with a copied context).
+        """
+        span = self.start_span(name, kind, **attributes)
+        token = _current_span.set(span)
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span, error)
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer: Tracer | None = None
+
+
+def configure_tracing(*exporters: SpanExporter) -> Tracer:
+    """
+    Enables tracing for the whole process. Without exporters, the spans are kept in memory.
+
+    Args:
+        *exporters (SpanExporter): The exporters receiving the finished spans.
+
+    Returns:
+        Tracer: The new tracer.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.shutdown()
+    _tracer = Tracer(list(exporters) or [InMemoryExporter()])
+    return _tracer
+
+
+def disable_tracing():
+    """
+    Disables tracing, flushing and closing the exporters.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.shutdown()
+    _tracer = None
+
+
+def get_tracer() -> Tracer | None:
+    return _tracer
+
+
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Returns a context manager running its body in a new span, or a no-op one when tracing is
+    disabled.
+
+    Args:
+        name (str): The name of the operation.
+        kind (str, optional): "llm" for requests to a model, "internal" (default) otherwise.
+        **attributes: The initial attributes of the span.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.span(name, kind, **attributes)
+
+
+def start_span(name: str, kind: str = "internal", **attributes) -> Span | _NoopSpan:
+    """
+    Starts a span that is not made current (see `Tracer.start_span`), or returns a no-op one
+    when tracing is disabled. It must be ended with `end_span`.
+    """
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.start_span(name, kind, **attributes)
+
+
+def end_span(span: Span | _NoopSpan, error: BaseException | None = None):
+    if _tracer is not None and isinstance(span, Span):
+        _tracer.end_span(span, error)
+
+
+def record_usage(span: Span | _NoopSpan, response: Any):
+    """
+    Copies the token usage reported in a completion to the attributes of a span.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        span.set_attributes(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            total_tokens=getattr(usage, "total_tokens", None),
+        )
+
+
+def summarize_spans(spans: list[Span]) -> dict[str, dict]:
+    """
+    Aggregates spans by name, to see where the time and the tokens go.
+
+    Args:
+        spans (list[Span]): The finished spans.
+
+    Returns:
+        dict[str, dict]: A dictionary mapping each span name to its count, total and mean duration
+                         (in milliseconds), errors and prompt/completion tokens.
+    """
+    summary: dict[str, dict] = defaultdict(
+        lambda: {
+            "count": 0,
+            "errors": 0,
+            "total_ms": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cache_hits": 0,
+        }
+    )
+    for span in spans:
+        entry = summary[span.name]
+        entry["count"] += 1
+        entry["errors"] += span.error is not None
+        entry["total_ms"] += span.duration_ms or 0.0
+        entry["prompt_tokens"] += span.attributes.get("prompt_tokens") or 0
+        entry["completion_tokens"] += span.attributes.get("completion_tokens") or 0
+        entry["cache_hits"] += bool(span.attributes.get("cache_hit"))
+    for entry in summary.values():
+        entry["mean_ms"] = entry["total_ms"] / entry["count"]
+    return dict(summary)